@@ -38,7 +38,7 @@ from user_service.enums import (
 )
 from user_service.models import GenerationTask, Prompt, Subscription, User
 from user_service.repository import create_user
-from user_service.schemas import UserCreate
+from user_service.schemas import GenerationTaskStatusCode, UserCreate
 
 router = APIRouter(prefix="/api/v1/admin", tags=["admin"])
 logger = structlog.get_logger(__name__)
@@ -679,7 +679,7 @@ async def list_generations(
     page_size: int = Query(default=20, ge=1, le=100),
     user_id: int | None = Query(default=None),
     prompt_id: int | None = Query(default=None),
-    status: GenerationTaskStatus | None = Query(default=None),
+    status: GenerationTaskStatusCode | None = Query(default=None),
     session: AsyncSession = Depends(get_db_session),
     _admin: User = Depends(require_admin),
 ) -> PaginatedResponse:
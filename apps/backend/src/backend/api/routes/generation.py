@@ -130,7 +130,7 @@ def _task_to_dict(task: GenerationTask) -> dict[str, Any]:
         "input_url": task.input_url,
         "created_at": task.created_at,
         "updated_at": task.updated_at,
-        "metadata": dict(task.metadata_dict),
+        "metadata": dict(task.meta_data),
         "error_message": task.error_message,
     }
 
@@ -15,6 +15,7 @@ from user_service.enums import (
     SubscriptionTier,
     UserRole,
 )
+from user_service.schemas import GenerationTaskStatusCode
 
 __all__ = [
     "PaginatedResponse",
@@ -184,7 +185,7 @@ class AdminGenerationResponse(BaseModel):
 
 
 class AdminGenerationUpdate(BaseModel):
-    status: GenerationTaskStatus | None = None
+    status: GenerationTaskStatusCode | None = None
     error: str | None = None
 
     model_config = ConfigDict(extra="forbid")
@@ -29,7 +29,10 @@ class User(UUIDPrimaryKeyMixin, TimestampMixin, Base):
     __table_args__ = (UniqueConstraint("email", name="uq_auth_users_email"),)
 
     email: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
-    hashed_password: Mapped[str] = mapped_column(String(255), nullable=False)
+    # Only credential checks read the hash; they undefer it explicitly.
+    hashed_password: Mapped[str] = mapped_column(
+        String(255), nullable=False, deferred=True, deferred_raiseload=True
+    )
     role: Mapped[UserRole] = mapped_column(
         Enum(UserRole, name="auth_user_role", native_enum=False),
         default=UserRole.USER,
@@ -7,6 +7,7 @@ from datetime import UTC, datetime, timedelta
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer
 
 from backend.auth.enums import UserRole
 from backend.auth.exceptions import (
@@ -112,7 +113,11 @@ class AuthService:
         ip_address: str | None,
     ) -> AuthResult:
         normalized_email = email.strip().lower()
-        user = await session.scalar(select(User).where(User.email == normalized_email))
+        user = await session.scalar(
+            select(User)
+            .options(undefer(User.hashed_password))
+            .where(User.email == normalized_email)
+        )
         if user is None or not verify_password(password, user.hashed_password):
             raise InvalidCredentialsError
 
@@ -46,13 +46,13 @@ class UUIDPrimaryKeyMixin:
 class TimestampMixin:
     created_at: Mapped[dt.datetime] = mapped_column(
         UTCDateTime(),
-        server_default=func.now(),
+        server_default=func.current_timestamp(),
         nullable=False,
     )
     updated_at: Mapped[dt.datetime] = mapped_column(
         UTCDateTime(),
-        server_default=func.now(),
-        onupdate=func.now(),
+        server_default=func.current_timestamp(),
+        onupdate=func.current_timestamp(),
         nullable=False,
     )
 
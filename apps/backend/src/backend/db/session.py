@@ -7,10 +7,10 @@ from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
     async_sessionmaker,
-    create_async_engine,
 )
 
 from backend.core.config import Settings, get_settings
+from user_service.database import create_engine
 
 _ENGINE: AsyncEngine | None = None
 _SESSION_FACTORY: async_sessionmaker[AsyncSession] | None = None
@@ -21,11 +21,8 @@ def get_engine(settings: Settings | None = None) -> AsyncEngine:
     if _ENGINE is None:
         settings = settings or get_settings()
         dsn = cast(str, settings.database.dsn)
-        _ENGINE = create_async_engine(
-            dsn,
-            echo=settings.database.echo,
-            pool_pre_ping=True,
-        )
+        # Shares the SQLite WAL/busy_timeout pragmas with the user service.
+        _ENGINE = create_engine(dsn, echo=settings.database.echo)
     return _ENGINE
 
 
@@ -125,7 +125,7 @@ class TaskStatusBroadcaster:
             "input_url": task.input_url,
             "created_at": task.created_at.isoformat(),
             "updated_at": task.updated_at.isoformat(),
-            "metadata": dict(task.metadata_dict),
+            "metadata": dict(task.meta_data),
             "error": task.error_message,
         }
 
@@ -21,7 +21,7 @@ from .enums import GenerationEventType, GenerationTaskStatus
 __all__ = ["GenerationTask", "GenerationTaskEvent"]
 
 
-class GenerationTask(Base, MetadataAliasMixin, UUIDPrimaryKeyMixin, TimestampMixin):
+class GenerationTask(MetadataAliasMixin, Base, UUIDPrimaryKeyMixin, TimestampMixin):
     """Persistent representation of an image generation request."""
 
     __tablename__ = "backend_generation_tasks"
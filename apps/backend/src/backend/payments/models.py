@@ -27,7 +27,7 @@ from backend.db.types import GUID, JSONType, UTCDateTime
 from .enums import PaymentEventType, PaymentProvider, PaymentStatus
 
 
-class Payment(Base, MetadataAliasMixin, UUIDPrimaryKeyMixin, TimestampMixin):
+class Payment(MetadataAliasMixin, Base, UUIDPrimaryKeyMixin, TimestampMixin):
     """Represents a payment attempt from a payment provider."""
 
     __tablename__ = "payments"
@@ -688,9 +688,9 @@ class PaymentService:
     def _apply_metadata_updates(
         self, payment: Payment, updates: Mapping[str, Any]
     ) -> None:
-        metadata: dict[str, Any] = dict(payment.metadata_dict)
+        metadata: dict[str, Any] = dict(payment.meta_data)
         metadata.update(updates)
-        payment.metadata_dict = metadata
+        payment.meta_data = metadata
 
     def _extract_event_name(
         self, payload: Mapping[str, object], provider: PaymentProvider
@@ -11,7 +11,7 @@ import jwt
 from pydantic import BaseModel, ConfigDict, Field, HttpUrl, field_validator
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import contains_eager
 
 from user_service import repository, services
 from user_service.enums import UserRole
@@ -172,10 +172,12 @@ class TelegramAuthService:
     async def _get_user_by_telegram_id(
         self, session: AsyncSession, telegram_id: int
     ) -> User | None:
+        # Populate ``User.profile`` from the filtering JOIN rather than a second
+        # eager JOIN against the same table.
         stmt = (
             select(User)
-            .options(joinedload(User.profile))
-            .join(UserProfile, UserProfile.user_id == User.id)
+            .join(User.profile)
+            .options(contains_eager(User.profile))
             .where(UserProfile.telegram_id == telegram_id)
         )
         result = await session.execute(stmt)
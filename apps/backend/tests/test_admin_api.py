@@ -546,6 +546,35 @@ class TestAdminGenerations:
         assert data["total"] >= 1
         assert all(item["status"] == "failed" for item in data["items"])
 
+    async def test_list_generations_accepts_legacy_status_filter(
+        self,
+        async_client: AsyncClient,
+        session_factory: async_sessionmaker[AsyncSession],
+    ) -> None:
+        admin = await create_user(session_factory, role=UserRole.ADMIN)
+        user = await create_user(session_factory)
+        prompt = await create_prompt(session_factory)
+        await create_generation(
+            session_factory, user, prompt, status=GenerationTaskStatus.COMPLETED
+        )
+
+        response = await async_client.get(
+            "/api/v1/admin/generations?status=succeeded",
+            headers={"X-User-Id": str(admin.id)},
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] >= 1
+        assert all(item["status"] == "completed" for item in data["items"])
+
+        response = await async_client.get(
+            "/api/v1/admin/generations?status=bogus",
+            headers={"X-User-Id": str(admin.id)},
+        )
+
+        assert response.status_code == 422
+
     async def test_get_generation_by_id(
         self,
         async_client: AsyncClient,
@@ -589,6 +618,33 @@ class TestAdminGenerations:
         assert data["status"] == "failed"
         assert data["error"] == "Admin marked as failed"
 
+    async def test_update_generation_accepts_legacy_status(
+        self,
+        async_client: AsyncClient,
+        session_factory: async_sessionmaker[AsyncSession],
+    ) -> None:
+        admin = await create_user(session_factory, role=UserRole.ADMIN)
+        user = await create_user(session_factory)
+        prompt = await create_prompt(session_factory)
+        generation = await create_generation(session_factory, user, prompt)
+
+        response = await async_client.patch(
+            f"/api/v1/admin/generations/{generation.id}",
+            json={"status": "succeeded"},
+            headers={"X-User-Id": str(admin.id)},
+        )
+
+        assert response.status_code == 200
+        assert response.json()["status"] == "completed"
+
+        response = await async_client.patch(
+            f"/api/v1/admin/generations/{generation.id}",
+            json={"status": "bogus"},
+            headers={"X-User-Id": str(admin.id)},
+        )
+
+        assert response.status_code == 422
+
     async def test_moderate_generation_approve(
         self,
         async_client: AsyncClient,
@@ -0,0 +1,48 @@
+"""store enum member values instead of member names
+
+Revision ID: 0010_store_enum_values
+Revises: 0006_add_prompt_latest_index
+Create Date: 2026-10-16 00:00:00.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0010_store_enum_values"
+down_revision = "0006_add_prompt_latest_index"
+branch_labels = None
+depends_on = None
+
+# Every affected enum uses the lower-cased member name as its value, so the
+# rewrite is a plain case conversion. generation_tasks.status already stored
+# values and is left alone.
+ENUM_COLUMNS = (
+    ("users", "role"),
+    ("subscriptions", "tier"),
+    ("subscriptions", "status"),
+    ("subscription_history", "tier"),
+    ("subscription_history", "status"),
+    ("payments", "status"),
+    ("transactions", "type"),
+    ("prompts", "category"),
+    ("prompts", "source"),
+    ("generation_tasks", "source"),
+)
+
+
+def upgrade() -> None:
+    for table, column in ENUM_COLUMNS:
+        op.execute(
+            f"UPDATE {table} SET {column} = lower({column}) "
+            f"WHERE {column} <> lower({column})"
+        )
+
+
+def downgrade() -> None:
+    for table, column in ENUM_COLUMNS:
+        op.execute(
+            f"UPDATE {table} SET {column} = upper({column}) "
+            f"WHERE {column} <> upper({column})"
+        )
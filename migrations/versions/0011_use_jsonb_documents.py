@@ -0,0 +1,60 @@
+"""store JSON documents as JSONB on PostgreSQL
+
+Revision ID: 0011_use_jsonb_documents
+Revises: 0010_store_enum_values
+Create Date: 2026-10-16 00:00:00.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0011_use_jsonb_documents"
+down_revision = "0010_store_enum_values"
+branch_labels = None
+depends_on = None
+
+JSON_COLUMNS = (
+    ("subscriptions", "provider_data"),
+    ("subscriptions", "metadata"),
+    ("subscription_history", "provider_data"),
+    ("subscription_history", "metadata"),
+    ("payments", "provider_data"),
+    ("payments", "metadata"),
+    ("transactions", "metadata"),
+    ("prompts", "parameters_schema"),
+    ("prompts", "parameters"),
+    ("generation_tasks", "parameters"),
+    ("generation_tasks", "result_parameters"),
+)
+
+
+def _alter_types(target: str) -> None:
+    for table, column in JSON_COLUMNS:
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} DROP DEFAULT")
+        op.execute(
+            f"ALTER TABLE {table} ALTER COLUMN {column} "
+            f"TYPE {target} USING {column}::{target}"
+        )
+        op.execute(
+            f"ALTER TABLE {table} ALTER COLUMN {column} SET DEFAULT '{{}}'::{target}"
+        )
+
+
+def upgrade() -> None:
+    # SQLite has no JSONB; the JSON columns there are left untouched.
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    _alter_types("jsonb")
+    op.execute(
+        "CREATE INDEX ix_payments_provider_data_gin ON payments "
+        "USING gin (provider_data)"
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("DROP INDEX IF EXISTS ix_payments_provider_data_gin")
+    _alter_types("json")
@@ -0,0 +1,47 @@
+"""create user_balance_snapshot view over the transaction ledger
+
+Revision ID: 0013_create_user_balance_snapshot
+Revises: 0011_use_jsonb_documents
+Create Date: 2026-10-16 00:00:00.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0013_create_user_balance_snapshot"
+down_revision = "0011_use_jsonb_documents"
+branch_labels = None
+depends_on = None
+
+SNAPSHOT_QUERY = (
+    "SELECT user_id, "
+    "SUM(CASE WHEN type = 'charge' THEN amount ELSE 0 END) AS total_charged, "
+    "SUM(CASE WHEN type = 'refund' THEN amount ELSE 0 END) AS total_refunded, "
+    "SUM(CASE WHEN type = 'credit' THEN amount ELSE 0 END) AS total_credited, "
+    "COUNT(*) AS transaction_count "
+    "FROM transactions GROUP BY user_id"
+)
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute(
+            f"CREATE MATERIALIZED VIEW user_balance_snapshot AS {SNAPSHOT_QUERY} "
+            "WITH DATA"
+        )
+        # REFRESH ... CONCURRENTLY requires a unique index on the view.
+        op.execute(
+            "CREATE UNIQUE INDEX uq_user_balance_snapshot_user_id "
+            "ON user_balance_snapshot (user_id)"
+        )
+    else:
+        op.execute(f"CREATE VIEW user_balance_snapshot AS {SNAPSHOT_QUERY}")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("DROP MATERIALIZED VIEW IF EXISTS user_balance_snapshot")
+    else:
+        op.execute("DROP VIEW IF EXISTS user_balance_snapshot")
@@ -0,0 +1,34 @@
+"""add BRIN indexes for ledger time-range scans
+
+Revision ID: 0014_add_ledger_brin_indexes
+Revises: 0013_create_user_balance_snapshot
+Create Date: 2026-10-16 00:00:00.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0014_add_ledger_brin_indexes"
+down_revision = "0013_create_user_balance_snapshot"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # BRIN is PostgreSQL-only; other dialects keep sequential scans.
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("CREATE INDEX brin_payments_paid_at ON payments USING brin (paid_at)")
+    op.execute(
+        "CREATE INDEX brin_transactions_created_at ON transactions "
+        "USING brin (created_at)"
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("DROP INDEX IF EXISTS brin_transactions_created_at")
+    op.execute("DROP INDEX IF EXISTS brin_payments_paid_at")
@@ -0,0 +1,46 @@
+"""replace low-selectivity payment and transaction indexes with partial ones
+
+Revision ID: 0015_replace_low_selectivity_indexes
+Revises: 0014_add_ledger_brin_indexes
+Create Date: 2026-10-16 00:00:00.000000
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0015_replace_low_selectivity_indexes"
+down_revision = "0014_add_ledger_brin_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.drop_index("ix_payments_status", table_name="payments")
+    failed_clause = sa.text("status = 'failed'")
+    op.create_index(
+        "ix_payments_status_failed",
+        "payments",
+        ["id"],
+        sqlite_where=failed_clause,
+        postgresql_where=failed_clause,
+    )
+
+    op.drop_index("ix_transactions_type", table_name="transactions")
+    refund_clause = sa.text("type = 'refund'")
+    op.create_index(
+        "ix_transactions_user_refunds",
+        "transactions",
+        ["user_id"],
+        sqlite_where=refund_clause,
+        postgresql_where=refund_clause,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_transactions_user_refunds", table_name="transactions")
+    op.create_index("ix_transactions_type", "transactions", ["type"])
+    op.drop_index("ix_payments_status_failed", table_name="payments")
+    op.create_index("ix_payments_status", "payments", ["status"])
@@ -0,0 +1,51 @@
+"""use cached identity columns for append-heavy primary keys
+
+Revision ID: 0016_use_cached_identity_ids
+Revises: 0015_replace_low_selectivity_indexes
+Create Date: 2026-10-16 00:00:00.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0016_use_cached_identity_ids"
+down_revision = "0015_replace_low_selectivity_indexes"
+branch_labels = None
+depends_on = None
+
+TABLES = ("user_sessions", "transactions", "generation_tasks")
+ID_CACHE_SIZE = 200
+
+
+def upgrade() -> None:
+    # SQLite keeps its rowid-backed INTEGER primary keys.
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    for table in TABLES:
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN id DROP DEFAULT")
+        op.execute(f"DROP SEQUENCE IF EXISTS {table}_id_seq")
+        op.execute(
+            f"ALTER TABLE {table} ALTER COLUMN id "
+            f"ADD GENERATED BY DEFAULT AS IDENTITY (CACHE {ID_CACHE_SIZE})"
+        )
+        op.execute(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+            f"coalesce(max(id), 0) + 1, false) FROM {table}"
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    for table in TABLES:
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN id DROP IDENTITY")
+        op.execute(f"CREATE SEQUENCE {table}_id_seq OWNED BY {table}.id")
+        op.execute(
+            f"SELECT setval('{table}_id_seq', coalesce(max(id), 0) + 1, false) "
+            f"FROM {table}"
+        )
+        op.execute(
+            f"ALTER TABLE {table} ALTER COLUMN id SET DEFAULT nextval('{table}_id_seq')"
+        )
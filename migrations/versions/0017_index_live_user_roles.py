@@ -0,0 +1,34 @@
+"""index user roles for live accounts only
+
+Revision ID: 0017_index_live_user_roles
+Revises: 0016_use_cached_identity_ids
+Create Date: 2026-10-16 00:00:00.000000
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0017_index_live_user_roles"
+down_revision = "0016_use_cached_identity_ids"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.drop_index("ix_users_role", table_name="users")
+    live_clause = sa.text("deleted_at IS NULL")
+    op.create_index(
+        "ix_users_role_active",
+        "users",
+        ["role"],
+        sqlite_where=live_clause,
+        postgresql_where=live_clause,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_users_role_active", table_name="users")
+    op.create_index("ix_users_role", "users", ["role"], unique=False)
@@ -0,0 +1,42 @@
+"""allow a single active prompt version per slug
+
+Revision ID: 0018_unique_active_prompt_per_slug
+Revises: 0017_index_live_user_roles
+Create Date: 2026-10-16 00:00:00.000000
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0018_unique_active_prompt_per_slug"
+down_revision = "0017_index_live_user_roles"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Older rows may still carry several live versions of a slug; keep only the
+    # newest one active so the unique index can be built.
+    op.execute(
+        "UPDATE prompts SET is_active = FALSE "
+        "WHERE is_active AND EXISTS ("
+        "SELECT 1 FROM prompts AS newer "
+        "WHERE newer.slug = prompts.slug AND newer.is_active "
+        "AND newer.version > prompts.version)"
+    )
+    active_clause = sa.text("is_active")
+    op.create_index(
+        "uq_prompts_active_per_slug",
+        "prompts",
+        ["slug"],
+        unique=True,
+        sqlite_where=active_clause,
+        postgresql_where=active_clause,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_prompts_active_per_slug", table_name="prompts")
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from typing import Final
+
 DEFAULT_CATEGORIES: list[str] = [
     "Portrait",
     "Landscape",
@@ -51,5 +53,5 @@ PARAMETER_PRESETS: dict[str, dict[str, object]] = {
 }
 
 MAX_IMAGE_SIZE_BYTES: int = 10 * 1024 * 1024  # 10 MB
-ALLOWED_IMAGE_EXTENSIONS: set[str] = {".jpg", ".jpeg", ".png"}
-ALLOWED_IMAGE_MIME_TYPES: set[str] = {"image/jpeg", "image/png"}
+ALLOWED_IMAGE_EXTENSIONS: Final[frozenset[str]] = frozenset({".jpg", ".jpeg", ".png"})
+ALLOWED_IMAGE_MIME_TYPES: Final[frozenset[str]] = frozenset({"image/jpeg", "image/png"})
@@ -2,8 +2,8 @@
 
 from __future__ import annotations
 
-from pathlib import Path
-from typing import Final
+from collections.abc import Iterable
+from typing import Final, NamedTuple
 
 from .constants import (
     ALLOWED_IMAGE_EXTENSIONS,
@@ -13,20 +13,69 @@ from .constants import (
 from .exceptions import InvalidFileError
 
 _MAX_SIZE_HUMAN: Final[str] = "10 MB"
+_ALLOWED_EXT_HUMAN: Final[str] = ", ".join(sorted(ALLOWED_IMAGE_EXTENSIONS))
+_MISSING_SIZE_MESSAGE: Final[str] = (
+    "Unable to determine file size. Please re-upload the image."
+)
+_TOO_LARGE_MESSAGE: Final[str] = (
+    "The image is larger than 10 MB. Please upload a smaller JPEG or PNG file."
+)
+_UNSUPPORTED_TYPE_MESSAGE: Final[str] = (
+    "Unsupported file type. Only JPEG and PNG images are allowed."
+)
+_UNITS: Final[tuple[tuple[int, str], ...]] = (
+    (1, "B"),
+    (1024, "KB"),
+    (1024 * 1024, "MB"),
+)
 
 
 def human_readable_size(size_in_bytes: int) -> str:
     """Convert a size in bytes into a human-readable string."""
 
-    if size_in_bytes < 1024:
+    # Every unit step is 2**10, so the bit length selects the unit directly.
+    index = min((size_in_bytes.bit_length() - 1) // 10, 2) if size_in_bytes > 0 else 0
+    if index == 0:
         return f"{size_in_bytes} B"
-    if size_in_bytes < 1024 * 1024:
-        return f"{size_in_bytes / 1024:.1f} KB"
-    return f"{size_in_bytes / (1024 * 1024):.1f} MB"
+    divisor, unit = _UNITS[index]
+    return f"{size_in_bytes / divisor:.1f} {unit}"
+
+
+class ImageFile(NamedTuple):
+    """File attributes reported by Telegram for a single uploaded image."""
+
+    file_name: str | None
+    file_size: int | None
+    mime_type: str | None
+
+
+def _check(file_name: str | None, file_size: int | None, mime_type: str | None) -> None:
+    if file_size is None:
+        raise InvalidFileError(_MISSING_SIZE_MESSAGE)
+
+    if file_size > MAX_IMAGE_SIZE_BYTES:
+        raise InvalidFileError(_TOO_LARGE_MESSAGE)
+
+    if mime_type and mime_type not in ALLOWED_IMAGE_MIME_TYPES:
+        raise InvalidFileError(_UNSUPPORTED_TYPE_MESSAGE)
+
+    if file_name:
+        # Slice the suffix manually instead of building a ``PurePath``; a leading
+        # dot (e.g. ``.png``) is a hidden file name, not an extension.
+        dot = file_name.rfind(".")
+        extension = file_name[dot:].lower() if dot > 0 else ""
+        if extension not in ALLOWED_IMAGE_EXTENSIONS:
+            raise InvalidFileError(
+                f"Unsupported extension '{extension}'. "
+                f"Allowed extensions: {_ALLOWED_EXT_HUMAN}."
+            )
 
 
 def validate_image(
-    *, file_name: str | None, file_size: int | None, mime_type: str | None
+    *,
+    file_name: str | None,
+    file_size: int | None,
+    mime_type: str | None,
 ) -> None:
     """Validate that the provided file looks like a supported image.
 
@@ -39,25 +88,20 @@ def validate_image(
         InvalidFileError: If the file is too large or not a supported type.
     """
 
-    if file_size is None:
-        raise InvalidFileError(
-            "Unable to determine file size. Please re-upload the image."
-        )
+    _check(file_name, file_size, mime_type)
 
-    if file_size > MAX_IMAGE_SIZE_BYTES:
-        raise InvalidFileError(
-            "The image is larger than 10 MB. Please upload a smaller JPEG or PNG file."
-        )
 
-    if mime_type and mime_type not in ALLOWED_IMAGE_MIME_TYPES:
-        raise InvalidFileError(
-            "Unsupported file type. Only JPEG and PNG images are allowed."
-        )
+def validate_images(files: Iterable[ImageFile]) -> None:
+    """Validate a batch of uploaded images, such as a Telegram media album.
 
-    if file_name:
-        extension = Path(file_name).suffix.lower()
-        if extension not in ALLOWED_IMAGE_EXTENSIONS:
-            allowed = ", ".join(sorted(ALLOWED_IMAGE_EXTENSIONS))
-            raise InvalidFileError(
-                f"Unsupported extension '{extension}'. Allowed extensions: {allowed}."
-            )
+    Applies the same checks as :func:`validate_image` to every file.
+
+    Args:
+        files: The files to validate, in upload order.
+
+    Raises:
+        InvalidFileError: For the first file that fails validation.
+    """
+
+    for file_name, file_size, mime_type in files:
+        _check(file_name, file_size, mime_type)
@@ -1,75 +1,45 @@
 from __future__ import annotations
 
-from collections.abc import Callable, Mapping
-from functools import wraps
-from typing import Any, ClassVar, cast
+from collections.abc import Mapping
+from typing import Any, Final
 
 __all__ = ["MetadataAliasMixin"]
 
+_MISSING: Final = object()
+
 
 class MetadataAliasMixin:
-    """Provide instance-level JSON metadata dict access via metadata_dict property.
+    """Accept a legacy ``metadata`` keyword for the ``meta_data`` JSON column.
 
-    This mixin provides a property `metadata_dict` for accessing the JSON metadata
-    from the ``meta_data`` column, while not interfering with SQLAlchemy's
-    ``metadata`` class attribute on DeclarativeBase.
+    The JSON payload is mapped as ``meta_data`` (stored in the ``metadata``
+    column) so it does not clash with SQLAlchemy's ``metadata`` class attribute
+    on DeclarativeBase; read and assign it through ``meta_data`` directly.
 
-    The mixin also supports initializing instances with a ``metadata`` keyword
+    The mixin supports initializing instances with a ``metadata`` keyword
     argument that will be stored in the ``meta_data`` column for backward
-    compatibility.
+    compatibility. It must be listed before the declarative ``Base`` so that its
+    ``__init__`` runs ahead of the declarative constructor.
     """
 
-    meta_data: dict[str, Any]
-
-    _metadata_marker: ClassVar[object] = object()
-
-    def __init_subclass__(cls, **kwargs: Any) -> None:
-        """Wrap the class __init__ to handle metadata argument transformation.
-
-        This method automatically wraps the __init__ of any subclass to intercept
-        the 'metadata' kwarg and remap it to 'meta_data' before calling the
-        original __init__. This avoids conflicts with SQLAlchemy's class-level
-        'metadata' attribute while maintaining backward compatibility.
-        """
-        super().__init_subclass__(**kwargs)
-        original_init = cast(Callable[..., None], cls.__init__)
+    __slots__ = ()
 
-        if getattr(original_init, "__metadata_alias_wrapped__", False):
-            return
+    meta_data: dict[str, Any]
 
-        @wraps(original_init)
-        def wrapped_init(self: Any, *args: Any, **init_kwargs: Any) -> None:
-            metadata_value = init_kwargs.pop(
-                "metadata",
-                cls._metadata_marker,
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        metadata_value = kwargs.pop("metadata", _MISSING)
+        if metadata_value is not _MISSING and "meta_data" not in kwargs:
+            kwargs["meta_data"] = (
+                metadata_value
+                if type(metadata_value) is dict
+                else MetadataAliasMixin._coerce_metadata(metadata_value)
             )
-            if (
-                metadata_value is not cls._metadata_marker
-                and "meta_data" not in init_kwargs
-            ):
-                init_kwargs["meta_data"] = cls._coerce_metadata(metadata_value)
-            original_init(self, *args, **init_kwargs)
-
-        # Cast to Any to avoid mypy error when setting custom attribute on function
-        wrapped_init_any = cast(Any, wrapped_init)
-        wrapped_init_any.__metadata_alias_wrapped__ = True
-        cast(Any, cls).__init__ = wrapped_init_any
-
-    @property
-    def metadata_dict(self) -> dict[str, Any]:
-        """Access the mapped metadata payload with explicit typing."""
-        return self.meta_data
-
-    @metadata_dict.setter
-    def metadata_dict(self, value: Mapping[str, Any]) -> None:
-        self.meta_data = self._coerce_metadata(value)
-
-    @metadata_dict.deleter
-    def metadata_dict(self) -> None:
-        del self.meta_data
+        super().__init__(*args, **kwargs)
 
     @staticmethod
     def _coerce_metadata(value: Any) -> dict[str, Any]:
+        # Plain dicts are stored as-is; other mappings are copied into a dict.
+        if type(value) is dict:
+            return value
         if isinstance(value, Mapping):
             return dict(value)
         raise TypeError("metadata assignments must be mapping types")
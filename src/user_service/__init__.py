@@ -1,5 +1,9 @@
 """User domain package providing models, schemas, repositories, and services."""
 
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
 from .enums import (
     GenerationTaskSource,
     GenerationTaskStatus,
@@ -11,21 +15,53 @@ from .enums import (
     TransactionType,
     UserRole,
 )
-from .models import (
-    Base,
-    GenerationTask,
-    Payment,
-    Prompt,
-    Subscription,
-    SubscriptionHistory,
-    SubscriptionPlan,
-    Transaction,
-    User,
-    UserProfile,
-    UserSession,
+
+if TYPE_CHECKING:
+    from .models import (
+        Base,
+        GenerationTask,
+        Payment,
+        Prompt,
+        Subscription,
+        SubscriptionHistory,
+        SubscriptionPlan,
+        Transaction,
+        User,
+        UserBalanceSnapshot,
+        UserProfile,
+        UserSession,
+    )
+
+# Models are imported on first access so enum-only imports skip mapper setup.
+_MODEL_NAMES = frozenset(
+    {
+        "Base",
+        "GenerationTask",
+        "Payment",
+        "Prompt",
+        "Subscription",
+        "SubscriptionHistory",
+        "SubscriptionPlan",
+        "Transaction",
+        "User",
+        "UserBalanceSnapshot",
+        "UserProfile",
+        "UserSession",
+    }
 )
 
-__all__ = [
+
+def __getattr__(name: str) -> Any:
+    if name in _MODEL_NAMES:
+        from . import models
+
+        value = getattr(models, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = (
     "Base",
     "GenerationTask",
     "Payment",
@@ -35,6 +71,7 @@ __all__ = [
     "SubscriptionPlan",
     "Transaction",
     "User",
+    "UserBalanceSnapshot",
     "UserProfile",
     "UserSession",
     "GenerationTaskSource",
@@ -46,4 +83,4 @@ __all__ = [
     "SubscriptionTier",
     "TransactionType",
     "UserRole",
-]
+)
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
-from collections.abc import AsyncIterator
-from contextlib import asynccontextmanager
+from collections.abc import Mapping
+from functools import lru_cache
+from types import MappingProxyType, TracebackType
 from typing import Any
 
+import orjson
 from sqlalchemy import event
 from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import (
@@ -12,60 +14,123 @@ from sqlalchemy.ext.asyncio import (
     async_sessionmaker,
     create_async_engine,
 )
+from sqlalchemy.pool import StaticPool
 
+_SQLITE_PRAGMAS = (
+    "PRAGMA busy_timeout=30000; PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL;"
+)
+QUERY_CACHE_SIZE = 1200
+INSERTMANYVALUES_PAGE_SIZE = 1000
+
+
+def _json_dumps(value: Any) -> str:
+    # Integer keys are stringified, matching the stdlib serializer it replaces.
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
 
-def create_engine(url: str, *, echo: bool = False) -> AsyncEngine:
-    """Create an async engine for the given database URL."""
+
+@lru_cache(maxsize=32)
+def _engine_template(url: str) -> tuple[bool, bool, Mapping[str, Any]]:
+    """Return SQLite/in-memory flags for ``url`` and the driver connect arguments."""
 
     url_obj = make_url(url)
     is_sqlite = url_obj.get_backend_name().startswith("sqlite")
-
+    is_memory = is_sqlite and url_obj.database in (None, "", ":memory:")
     connect_args: dict[str, Any] = {}
     if is_sqlite:
         connect_args["timeout"] = 30
+        connect_args["check_same_thread"] = False
+    return is_sqlite, is_memory, MappingProxyType(connect_args)
+
+
+def create_engine(url: str, *, echo: bool = False) -> AsyncEngine:
+    """Create an async engine for the given database URL."""
+
+    is_sqlite, is_memory, connect_args = _engine_template(url)
 
     engine_kwargs: dict[str, Any] = {
         "echo": echo,
         "future": True,
-        "pool_pre_ping": True,
+        "query_cache_size": QUERY_CACHE_SIZE,
+        "insertmanyvalues_page_size": INSERTMANYVALUES_PAGE_SIZE,
+        "json_serializer": _json_dumps,
+        "json_deserializer": orjson.loads,
+        # SQLite connections are local files, so a liveness probe buys nothing.
+        "pool_pre_ping": not is_sqlite,
     }
     if connect_args:
-        engine_kwargs["connect_args"] = connect_args
+        engine_kwargs["connect_args"] = dict(connect_args)
+    if is_memory:
+        # aiosqlite already defaults to StaticPool for ``:memory:``; pin it so the
+        # single shared in-memory database does not hinge on that dialect default.
+        engine_kwargs["poolclass"] = StaticPool
 
     engine = create_async_engine(url, **engine_kwargs)
 
     if is_sqlite:
 
-        @event.listens_for(engine.sync_engine, "connect")
+        @event.listens_for(engine.sync_engine, "connect", insert=True)
         def _set_sqlite_pragma(dbapi_connection: Any, connection_record: Any) -> None:
-            cursor = dbapi_connection.cursor()
-            try:
-                cursor.execute("PRAGMA busy_timeout=30000")
-                cursor.execute("PRAGMA journal_mode=WAL")
-            finally:
-                cursor.close()
+            # Apply every pragma in one driver call on the raw aiosqlite connection.
+            dbapi_connection.run_async(
+                lambda connection: connection.executescript(_SQLITE_PRAGMAS)
+            )
 
     return engine
 
 
 def create_session_factory(
-    engine: AsyncEngine, *, expire_on_commit: bool = False
+    engine: AsyncEngine, *, expire_on_commit: bool = False, autoflush: bool = True
 ) -> async_sessionmaker[AsyncSession]:
-    """Return an async session factory bound to the provided engine."""
+    """Return an async session factory bound to the provided engine.
+
+    Read-only callers can pass ``autoflush=False`` to skip the pending-change
+    scan that otherwise runs before every query.
+    """
+
+    return async_sessionmaker(
+        engine, expire_on_commit=expire_on_commit, autoflush=autoflush
+    )
+
 
-    return async_sessionmaker(engine, expire_on_commit=expire_on_commit)
+class _SessionScope:
+    """Async context manager committing on success and rolling back on error."""
 
+    __slots__ = ("_factory", "_session")
 
-@asynccontextmanager
-async def session_scope(
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession]) -> None:
+        self._factory = session_factory
+        self._session: AsyncSession | None = None
+
+    async def __aenter__(self) -> AsyncSession:
+        session = self._factory()
+        self._session = await session.__aenter__()
+        return self._session
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        session = self._session
+        assert session is not None
+        self._session = None
+        try:
+            if exc_type is None:
+                try:
+                    await session.commit()
+                except Exception:
+                    await session.rollback()
+                    raise
+            elif issubclass(exc_type, Exception):
+                await session.rollback()
+        finally:
+            await session.__aexit__(exc_type, exc, tb)
+
+
+def session_scope(
     session_factory: async_sessionmaker[AsyncSession],
-) -> AsyncIterator[AsyncSession]:
+) -> _SessionScope:
     """Simple async context manager yielding a session and guaranteeing cleanup."""
 
-    async with session_factory() as session:
-        try:
-            yield session
-            await session.commit()
-        except Exception:
-            await session.rollback()
-            raise
+    return _SessionScope(session_factory)
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+from collections.abc import Mapping
 from enum import StrEnum
+from types import MappingProxyType
 
 
 class UserRole(StrEnum):
@@ -70,7 +72,11 @@ class PromptCategory(StrEnum):
 
 
 class GenerationTaskStatus(StrEnum):
-    """Lifecycle states for content generation tasks."""
+    """Lifecycle states for content generation tasks.
+
+    Legacy codes such as ``"succeeded"`` are only accepted by ``get_by_code``;
+    ``GenerationTaskStatus(value)`` performs a strict value lookup.
+    """
 
     PENDING = "pending"
     QUEUED = "queued"
@@ -80,20 +86,6 @@ class GenerationTaskStatus(StrEnum):
     CANCELED = "canceled"
     SUCCEEDED = COMPLETED
 
-    @classmethod
-    def _missing_(cls, value: object) -> GenerationTaskStatus | None:
-        if isinstance(value, str):
-            legacy_aliases = {"succeeded": cls.COMPLETED}
-            legacy = legacy_aliases.get(value.lower())
-            if legacy is not None:
-                return legacy
-        return None
-
-    @classmethod
-    def _get_legacy_aliases(cls) -> dict[str, GenerationTaskStatus]:
-        """Return the legacy alias mapping."""
-        return {"succeeded": cls.COMPLETED}
-
     @classmethod
     def get_by_code(cls, code: str) -> GenerationTaskStatus:
         """Look up a status by code string.
@@ -112,26 +104,23 @@ class GenerationTaskStatus(StrEnum):
         if not isinstance(code, str):
             raise ValueError(f"code must be a string, got {type(code).__name__}")
 
+        # Canonical input skips the strip/lower string allocations entirely
+        member = _STATUS_LOOKUP.get(code)
+        if member is not None:
+            return member
+
         normalized = code.strip().lower()
         if not normalized:
             raise ValueError("code must not be empty")
 
-        # Check legacy aliases first
-        legacy_aliases = cls._get_legacy_aliases()
-        if normalized in legacy_aliases:
-            return legacy_aliases[normalized]
-
-        # Try direct lookup
+        # Canonical values and legacy aliases share a single lookup table
         try:
-            return cls(normalized)
-        except ValueError as exc:
-            valid_codes = sorted(
-                {member.value for member in cls} | set(legacy_aliases.keys())
-            )
+            return _STATUS_LOOKUP[normalized]
+        except KeyError:
             raise ValueError(
                 f"invalid status code '{code}', must be one of: "
-                f"{', '.join(valid_codes)}"
-            ) from exc
+                f"{_VALID_STATUS_CODES_STR}"
+            ) from None
 
     @classmethod
     def get_name(cls, status: GenerationTaskStatus | str) -> str:
@@ -146,12 +135,13 @@ class GenerationTaskStatus(StrEnum):
         Raises:
             ValueError: If the status is not valid
         """
+        # Members are ``str`` instances holding their value, so ``str.__str__``
+        # yields the plain value without going through the ``.value`` property.
         if isinstance(status, cls):
-            return status.value
+            return str.__str__(status)
 
         if isinstance(status, str):
-            resolved = cls.get_by_code(status)
-            return resolved.value
+            return str.__str__(cls.get_by_code(status))
 
         raise ValueError(
             f"status must be a GenerationTaskStatus or string, "
@@ -159,6 +149,18 @@ class GenerationTaskStatus(StrEnum):
         )
 
 
+_LEGACY_STATUS_ALIASES: Mapping[str, GenerationTaskStatus] = MappingProxyType(
+    {"succeeded": GenerationTaskStatus.COMPLETED}
+)
+_STATUS_LOOKUP: Mapping[str, GenerationTaskStatus] = MappingProxyType(
+    {
+        **{member.value: member for member in GenerationTaskStatus},
+        **_LEGACY_STATUS_ALIASES,
+    }
+)
+_VALID_STATUS_CODES_STR = ", ".join(sorted(_STATUS_LOOKUP))
+
+
 class GenerationTaskSource(StrEnum):
     """Indicates how a generation task was initiated."""
 
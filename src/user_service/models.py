@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime
 from decimal import Decimal
+from enum import StrEnum
 from typing import Any, ClassVar, TypeAlias
 
 from sqlalchemy import (
@@ -9,19 +10,23 @@ from sqlalchemy import (
     BigInteger,
     Boolean,
     CheckConstraint,
+    Column,
     DateTime,
     Enum,
     ForeignKey,
+    Identity,
     Index,
     Integer,
     MetaData,
     Numeric,
     String,
+    Table,
     Text,
     UniqueConstraint,
     func,
     text,
 )
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 from common.sqlalchemy import MetadataAliasMixin
@@ -41,8 +46,19 @@ from .enums import (
 # Type alias for JSON dictionary columns
 JSONDict: TypeAlias = dict[str, Any]
 
+# PostgreSQL keeps JSON documents as pre-parsed JSONB; other dialects use JSON.
+JSONDocument = JSON().with_variant(JSONB(), "postgresql")
+
 BIGINT_PK = BigInteger().with_variant(Integer, "sqlite")
 
+# Append-heavy tables draw ids from identity sequences that hand each
+# PostgreSQL session a block of values at a time; SQLite ignores Identity.
+ID_CACHE_SIZE = 200
+
+# Raw provider payloads on payments and subscription history are audit data
+# that no listing reads; they load only with undefer_group().
+PROVIDER_PAYLOAD_GROUP = "provider_payload"
+
 metadata = MetaData(
     naming_convention={
         "ix": "ix_%(column_0_label)s",
@@ -54,9 +70,8 @@ metadata = MetaData(
 )
 
 
-def _generation_status_values(
-    enum_cls: type[GenerationTaskStatus],
-) -> list[str]:
+def _enum_values(enum_cls: type[StrEnum]) -> list[str]:
+    # Persist member values (matching migrations and server defaults), not names.
     return [member.value for member in enum_cls]
 
 
@@ -66,7 +81,7 @@ class Base(DeclarativeBase):
     metadata: ClassVar[MetaData]
 
     type_annotation_map: ClassVar[dict[type[Any], Any]] = {
-        dict: JSON,
+        dict: JSONDocument,
     }
 
 
@@ -78,6 +93,7 @@ class SubscriptionPlan(Base):
     """Represents an available subscription plan template."""
 
     __tablename__ = "subscription_plans"
+    __mapper_args__ = {"eager_defaults": True}
 
     id: Mapped[int] = mapped_column(BIGINT_PK, primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(String(120), unique=True, nullable=False)
@@ -86,17 +102,19 @@ class SubscriptionPlan(Base):
         Numeric(12, 2), nullable=False, server_default=text("0")
     )
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), nullable=False, server_default=func.now()
+        DateTime(timezone=True), nullable=False, server_default=func.current_timestamp()
     )
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
-        server_default=func.now(),
-        onupdate=func.now(),
+        server_default=func.current_timestamp(),
+        onupdate=func.current_timestamp(),
     )
 
     users: Mapped[list[User]] = relationship(
-        back_populates="subscription_plan", passive_deletes=True
+        back_populates="subscription_plan",
+        passive_deletes=True,
+        lazy="raise_on_sql",
     )
 
 
@@ -105,12 +123,18 @@ class User(Base):
 
     __tablename__ = "users"
     __table_args__ = (UniqueConstraint("email", name="uq_users_email"),)
+    __mapper_args__ = {"eager_defaults": True}
 
     id: Mapped[int] = mapped_column(BIGINT_PK, primary_key=True, autoincrement=True)
     email: Mapped[str] = mapped_column(String(255), nullable=False)
-    hashed_password: Mapped[str] = mapped_column(String(255), nullable=False)
+    # Only credential checks read the hash; they undefer it explicitly.
+    hashed_password: Mapped[str] = mapped_column(
+        String(255), nullable=False, deferred=True, deferred_raiseload=True
+    )
     role: Mapped[UserRole] = mapped_column(
-        Enum(UserRole, name="user_role", native_enum=False),
+        Enum(
+            UserRole, name="user_role", native_enum=False, values_callable=_enum_values
+        ),
         nullable=False,
         default=UserRole.USER,
     )
@@ -125,13 +149,13 @@ class User(Base):
         Boolean, default=True, nullable=False, server_default=text("1")
     )
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), nullable=False, server_default=func.now()
+        DateTime(timezone=True), nullable=False, server_default=func.current_timestamp()
     )
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
-        server_default=func.now(),
-        onupdate=func.now(),
+        server_default=func.current_timestamp(),
+        onupdate=func.current_timestamp(),
     )
     deleted_at: Mapped[datetime | None] = mapped_column(
         DateTime(timezone=True), nullable=True
@@ -142,35 +166,63 @@ class User(Base):
         uselist=False,
         cascade="all, delete-orphan",
         passive_deletes=True,
+        lazy="raise_on_sql",
     )
     sessions: Mapped[list[UserSession]] = relationship(
-        back_populates="user", cascade="all, delete-orphan", passive_deletes=True
+        back_populates="user",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="raise_on_sql",
     )
     subscription_plan: Mapped[SubscriptionPlan | None] = relationship(
-        back_populates="users"
+        back_populates="users",
+        lazy="raise_on_sql",
     )
     subscriptions: Mapped[list[Subscription]] = relationship(
-        back_populates="user", cascade="all, delete-orphan", passive_deletes=True
+        back_populates="user",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="raise_on_sql",
     )
     payments: Mapped[list[Payment]] = relationship(
-        back_populates="user", cascade="all, delete-orphan", passive_deletes=True
+        back_populates="user",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="raise_on_sql",
     )
     transactions: Mapped[list[Transaction]] = relationship(
-        back_populates="user", cascade="all, delete-orphan", passive_deletes=True
+        back_populates="user",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="raise_on_sql",
     )
     generation_tasks: Mapped[list[GenerationTask]] = relationship(
-        back_populates="user", cascade="all, delete-orphan", passive_deletes=True
+        back_populates="user",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="raise_on_sql",
     )
 
 
-Index("ix_users_role", User.role)
+# Role filters only ever run over live accounts, so soft-deleted users are
+# left out of the index.
+Index(
+    "ix_users_role_active",
+    User.role,
+    sqlite_where=text("deleted_at IS NULL"),
+    postgresql_where=text("deleted_at IS NULL"),
+)
 
 
 class UserProfile(Base):
     """Stores extended profile information for a user."""
 
     __tablename__ = "user_profiles"
-    __table_args__ = (UniqueConstraint("user_id", name="uq_user_profiles_user_id"),)
+    __table_args__ = (
+        UniqueConstraint("user_id", name="uq_user_profiles_user_id"),
+        UniqueConstraint("telegram_id", name="uq_user_profiles_telegram_id"),
+    )
+    __mapper_args__ = {"eager_defaults": True}
 
     id: Mapped[int] = mapped_column(BIGINT_PK, primary_key=True, autoincrement=True)
     user_id: Mapped[int] = mapped_column(
@@ -183,22 +235,19 @@ class UserProfile(Base):
     country: Mapped[str | None] = mapped_column(String(80), nullable=True)
     city: Mapped[str | None] = mapped_column(String(80), nullable=True)
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), nullable=False, server_default=func.now()
+        DateTime(timezone=True), nullable=False, server_default=func.current_timestamp()
     )
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
-        server_default=func.now(),
-        onupdate=func.now(),
+        server_default=func.current_timestamp(),
+        onupdate=func.current_timestamp(),
     )
     deleted_at: Mapped[datetime | None] = mapped_column(
         DateTime(timezone=True), nullable=True
     )
 
-    user: Mapped[User] = relationship(back_populates="profile")
-
-
-Index("ix_user_profiles_user_id", UserProfile.user_id)
+    user: Mapped[User] = relationship(back_populates="profile", lazy="raise_on_sql")
 
 
 class UserSession(Base):
@@ -208,8 +257,11 @@ class UserSession(Base):
     __table_args__ = (
         UniqueConstraint("session_token", name="uq_user_sessions_session_token"),
     )
+    __mapper_args__ = {"eager_defaults": True}
 
-    id: Mapped[int] = mapped_column(BIGINT_PK, primary_key=True, autoincrement=True)
+    id: Mapped[int] = mapped_column(
+        BIGINT_PK, Identity(start=1, cache=ID_CACHE_SIZE), primary_key=True
+    )
     user_id: Mapped[int] = mapped_column(
         ForeignKey("users.id", ondelete="CASCADE"), nullable=False
     )
@@ -220,13 +272,13 @@ class UserSession(Base):
         DateTime(timezone=True), nullable=False
     )
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), nullable=False, server_default=func.now()
+        DateTime(timezone=True), nullable=False, server_default=func.current_timestamp()
     )
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
-        server_default=func.now(),
-        onupdate=func.now(),
+        server_default=func.current_timestamp(),
+        onupdate=func.current_timestamp(),
     )
     revoked_at: Mapped[datetime | None] = mapped_column(
         DateTime(timezone=True), nullable=True
@@ -235,13 +287,13 @@ class UserSession(Base):
         DateTime(timezone=True), nullable=True
     )
 
-    user: Mapped[User] = relationship(back_populates="sessions")
+    user: Mapped[User] = relationship(back_populates="sessions", lazy="raise_on_sql")
 
 
 Index("ix_user_sessions_user_id", UserSession.user_id)
 
 
-class Subscription(Base, MetadataAliasMixin):
+class Subscription(MetadataAliasMixin, Base):
     """Tracks the lifecycle of a user's billing subscription."""
 
     __tablename__ = "subscriptions"
@@ -259,17 +311,28 @@ class Subscription(Base, MetadataAliasMixin):
             name="ck_subscriptions_period_order",
         ),
     )
+    __mapper_args__ = {"eager_defaults": True}
 
     id: Mapped[int] = mapped_column(BIGINT_PK, primary_key=True, autoincrement=True)
     user_id: Mapped[int] = mapped_column(
         ForeignKey("users.id", ondelete="CASCADE"), nullable=False
     )
     tier: Mapped[SubscriptionTier] = mapped_column(
-        Enum(SubscriptionTier, name="subscription_tier", native_enum=False),
+        Enum(
+            SubscriptionTier,
+            name="subscription_tier",
+            native_enum=False,
+            values_callable=_enum_values,
+        ),
         nullable=False,
     )
     status: Mapped[SubscriptionStatus] = mapped_column(
-        Enum(SubscriptionStatus, name="subscription_status", native_enum=False),
+        Enum(
+            SubscriptionStatus,
+            name="subscription_status",
+            native_enum=False,
+            values_callable=_enum_values,
+        ),
         nullable=False,
         default=SubscriptionStatus.ACTIVE,
         server_default=text("'active'"),
@@ -285,43 +348,52 @@ class Subscription(Base, MetadataAliasMixin):
     )
     provider_subscription_id: Mapped[str | None] = mapped_column(String(120))
     provider_data: Mapped[JSONDict] = mapped_column(
-        JSON, nullable=False, default=dict, server_default=text("'{}'")
+        JSONDocument, nullable=False, default=dict, server_default=text("'{}'")
     )
     meta_data: Mapped[dict[str, Any]] = mapped_column(
-        "metadata", JSON, nullable=False, default=dict, server_default=text("'{}'")
+        "metadata",
+        JSONDocument,
+        nullable=False,
+        default=dict,
+        server_default=text("'{}'"),
     )
     current_period_start: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), nullable=False, server_default=func.now()
+        DateTime(timezone=True), nullable=False, server_default=func.current_timestamp()
     )
     current_period_end: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), nullable=False
     )
     canceled_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), nullable=False, server_default=func.now()
+        DateTime(timezone=True), nullable=False, server_default=func.current_timestamp()
     )
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
-        server_default=func.now(),
-        onupdate=func.now(),
+        server_default=func.current_timestamp(),
+        onupdate=func.current_timestamp(),
     )
 
-    user: Mapped[User] = relationship(back_populates="subscriptions")
+    user: Mapped[User] = relationship(
+        back_populates="subscriptions", lazy="raise_on_sql"
+    )
     history: Mapped[list[SubscriptionHistory]] = relationship(
         back_populates="subscription",
         cascade="all, delete-orphan",
         passive_deletes=True,
+        lazy="raise_on_sql",
     )
     payments: Mapped[list[Payment]] = relationship(
         back_populates="subscription",
         cascade="all, delete-orphan",
         passive_deletes=True,
+        lazy="raise_on_sql",
     )
     transactions: Mapped[list[Transaction]] = relationship(
         back_populates="subscription",
         cascade="all, delete-orphan",
         passive_deletes=True,
+        lazy="raise_on_sql",
     )
 
 
@@ -335,21 +407,27 @@ Index(
 )
 
 
-class SubscriptionHistory(Base, MetadataAliasMixin):
+class SubscriptionHistory(MetadataAliasMixin, Base):
     """Immutable snapshots capturing subscription changes."""
 
     __tablename__ = "subscription_history"
+    __mapper_args__ = {"eager_defaults": True}
 
     id: Mapped[int] = mapped_column(BIGINT_PK, primary_key=True, autoincrement=True)
     subscription_id: Mapped[int] = mapped_column(
         ForeignKey("subscriptions.id", ondelete="CASCADE"), nullable=False
     )
     recorded_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), nullable=False, server_default=func.now()
+        DateTime(timezone=True), nullable=False, server_default=func.current_timestamp()
     )
     reason: Mapped[str | None] = mapped_column(String(255))
     tier: Mapped[SubscriptionTier] = mapped_column(
-        Enum(SubscriptionTier, name="subscription_history_tier", native_enum=False),
+        Enum(
+            SubscriptionTier,
+            name="subscription_history_tier",
+            native_enum=False,
+            values_callable=_enum_values,
+        ),
         nullable=False,
     )
     status: Mapped[SubscriptionStatus] = mapped_column(
@@ -357,6 +435,7 @@ class SubscriptionHistory(Base, MetadataAliasMixin):
             SubscriptionStatus,
             name="subscription_history_status",
             native_enum=False,
+            values_callable=_enum_values,
         ),
         nullable=False,
     )
@@ -365,10 +444,20 @@ class SubscriptionHistory(Base, MetadataAliasMixin):
     quota_used: Mapped[int] = mapped_column(Integer, nullable=False)
     provider_subscription_id: Mapped[str | None] = mapped_column(String(120))
     provider_data: Mapped[JSONDict] = mapped_column(
-        JSON, nullable=False, default=dict, server_default=text("'{}'")
+        JSONDocument,
+        nullable=False,
+        default=dict,
+        server_default=text("'{}'"),
+        deferred=True,
+        deferred_group=PROVIDER_PAYLOAD_GROUP,
+        deferred_raiseload=True,
     )
     meta_data: Mapped[dict[str, Any]] = mapped_column(
-        "metadata", JSON, nullable=False, default=dict, server_default=text("'{}'")
+        "metadata",
+        JSONDocument,
+        nullable=False,
+        default=dict,
+        server_default=text("'{}'"),
     )
     current_period_start: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), nullable=False
@@ -377,7 +466,9 @@ class SubscriptionHistory(Base, MetadataAliasMixin):
         DateTime(timezone=True), nullable=False
     )
 
-    subscription: Mapped[Subscription] = relationship(back_populates="history")
+    subscription: Mapped[Subscription] = relationship(
+        back_populates="history", lazy="raise_on_sql"
+    )
 
 
 Index(
@@ -386,10 +477,11 @@ Index(
 )
 
 
-class Payment(Base, MetadataAliasMixin):
+class Payment(MetadataAliasMixin, Base):
     """Represents a monetary settlement attempt for a subscription."""
 
     __tablename__ = "payments"
+    __mapper_args__ = {"eager_defaults": True}
 
     id: Mapped[int] = mapped_column(BIGINT_PK, primary_key=True, autoincrement=True)
     user_id: Mapped[int] = mapped_column(
@@ -401,35 +493,62 @@ class Payment(Base, MetadataAliasMixin):
     amount: Mapped[Decimal] = mapped_column(Numeric(12, 2), nullable=False)
     currency: Mapped[str] = mapped_column(String(3), nullable=False)
     status: Mapped[PaymentStatus] = mapped_column(
-        Enum(PaymentStatus, name="payment_status", native_enum=False),
+        Enum(
+            PaymentStatus,
+            name="payment_status",
+            native_enum=False,
+            values_callable=_enum_values,
+        ),
         nullable=False,
         default=PaymentStatus.COMPLETED,
         server_default=text("'completed'"),
     )
     provider_payment_id: Mapped[str | None] = mapped_column(String(120))
     provider_data: Mapped[JSONDict] = mapped_column(
-        JSON, nullable=False, default=dict, server_default=text("'{}'")
+        JSONDocument,
+        nullable=False,
+        default=dict,
+        server_default=text("'{}'"),
+        deferred=True,
+        deferred_group=PROVIDER_PAYLOAD_GROUP,
+        deferred_raiseload=True,
     )
     meta_data: Mapped[dict[str, Any]] = mapped_column(
-        "metadata", JSON, nullable=False, default=dict, server_default=text("'{}'")
+        "metadata",
+        JSONDocument,
+        nullable=False,
+        default=dict,
+        server_default=text("'{}'"),
     )
     paid_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), nullable=False, server_default=func.now()
+        DateTime(timezone=True), nullable=False, server_default=func.current_timestamp()
     )
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), nullable=False, server_default=func.now()
+        DateTime(timezone=True), nullable=False, server_default=func.current_timestamp()
     )
 
-    subscription: Mapped[Subscription | None] = relationship(back_populates="payments")
-    user: Mapped[User] = relationship(back_populates="payments")
+    subscription: Mapped[Subscription | None] = relationship(
+        back_populates="payments", lazy="raise_on_sql"
+    )
+    user: Mapped[User] = relationship(back_populates="payments", lazy="raise_on_sql")
     transactions: Mapped[list[Transaction]] = relationship(
-        back_populates="payment", cascade="all, delete-orphan", passive_deletes=True
+        back_populates="payment",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="raise_on_sql",
     )
 
 
 Index("ix_payments_user_id", Payment.user_id)
 Index("ix_payments_subscription_id", Payment.subscription_id)
-Index("ix_payments_status", Payment.status)
+# Only the rare failed payments are looked up by status; a full status index
+# would be updated on every insert for no read benefit.
+Index(
+    "ix_payments_status_failed",
+    Payment.id,
+    sqlite_where=text("status = 'failed'"),
+    postgresql_where=text("status = 'failed'"),
+)
 Index(
     "uq_payments_provider_payment_id",
     Payment.provider_payment_id,
@@ -437,14 +556,29 @@ Index(
     sqlite_where=text("provider_payment_id IS NOT NULL"),
     postgresql_where=text("provider_payment_id IS NOT NULL"),
 )
+Index(
+    "ix_payments_provider_data_gin",
+    Payment.provider_data,
+    postgresql_using="gin",
+).ddl_if(dialect="postgresql")
+# Ledger rows arrive in time order, so block-range indexes serve time-range
+# scans at a fraction of a B-tree's size and write cost.
+Index(
+    "brin_payments_paid_at",
+    Payment.paid_at,
+    postgresql_using="brin",
+).ddl_if(dialect="postgresql")
 
 
-class Transaction(Base, MetadataAliasMixin):
+class Transaction(MetadataAliasMixin, Base):
     """Ledger line item tied to a payment and optionally a subscription."""
 
     __tablename__ = "transactions"
+    __mapper_args__ = {"eager_defaults": True}
 
-    id: Mapped[int] = mapped_column(BIGINT_PK, primary_key=True, autoincrement=True)
+    id: Mapped[int] = mapped_column(
+        BIGINT_PK, Identity(start=1, cache=ID_CACHE_SIZE), primary_key=True
+    )
     payment_id: Mapped[int] = mapped_column(
         ForeignKey("payments.id", ondelete="CASCADE"), nullable=False
     )
@@ -457,29 +591,48 @@ class Transaction(Base, MetadataAliasMixin):
     amount: Mapped[Decimal] = mapped_column(Numeric(12, 2), nullable=False)
     currency: Mapped[str] = mapped_column(String(3), nullable=False)
     type: Mapped[TransactionType] = mapped_column(
-        Enum(TransactionType, name="transaction_type", native_enum=False),
+        Enum(
+            TransactionType,
+            name="transaction_type",
+            native_enum=False,
+            values_callable=_enum_values,
+        ),
         nullable=False,
     )
     description: Mapped[str | None] = mapped_column(String(255))
     provider_reference: Mapped[str | None] = mapped_column(String(120))
     meta_data: Mapped[dict[str, Any]] = mapped_column(
-        "metadata", JSON, nullable=False, default=dict, server_default=text("'{}'")
+        "metadata",
+        JSONDocument,
+        nullable=False,
+        default=dict,
+        server_default=text("'{}'"),
     )
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), nullable=False, server_default=func.now()
+        DateTime(timezone=True), nullable=False, server_default=func.current_timestamp()
     )
 
-    payment: Mapped[Payment] = relationship(back_populates="transactions")
+    payment: Mapped[Payment] = relationship(
+        back_populates="transactions", lazy="raise_on_sql"
+    )
     subscription: Mapped[Subscription | None] = relationship(
-        back_populates="transactions"
+        back_populates="transactions",
+        lazy="raise_on_sql",
+    )
+    user: Mapped[User] = relationship(
+        back_populates="transactions", lazy="raise_on_sql"
     )
-    user: Mapped[User] = relationship(back_populates="transactions")
 
 
 Index("ix_transactions_payment_id", Transaction.payment_id)
 Index("ix_transactions_subscription_id", Transaction.subscription_id)
 Index("ix_transactions_user_id", Transaction.user_id)
-Index("ix_transactions_type", Transaction.type)
+Index(
+    "ix_transactions_user_refunds",
+    Transaction.user_id,
+    sqlite_where=text("type = 'refund'"),
+    postgresql_where=text("type = 'refund'"),
+)
 Index(
     "uq_transactions_provider_reference",
     Transaction.provider_reference,
@@ -487,6 +640,37 @@ Index(
     sqlite_where=text("provider_reference IS NOT NULL"),
     postgresql_where=text("provider_reference IS NOT NULL"),
 )
+Index(
+    "brin_transactions_created_at",
+    Transaction.created_at,
+    postgresql_using="brin",
+).ddl_if(dialect="postgresql")
+
+# Per-user ledger totals. Migration 0013 owns the view's query and creates it
+# as a materialized view on PostgreSQL (a plain view elsewhere); the table
+# lives outside ``Base.metadata`` so ``create_all`` and autogenerate never
+# treat it as a table.
+user_balance_snapshot = Table(
+    "user_balance_snapshot",
+    MetaData(),
+    Column("user_id", BIGINT_PK, primary_key=True),
+    Column("total_charged", Numeric(12, 2), nullable=False),
+    Column("total_refunded", Numeric(12, 2), nullable=False),
+    Column("total_credited", Numeric(12, 2), nullable=False),
+    Column("transaction_count", Integer, nullable=False),
+)
+
+
+class UserBalanceSnapshot(Base):
+    """Read-only aggregate of a user's ledger, backed by a materialized view."""
+
+    __table__ = user_balance_snapshot
+
+    user_id: Mapped[int]
+    total_charged: Mapped[Decimal]
+    total_refunded: Mapped[Decimal]
+    total_credited: Mapped[Decimal]
+    transaction_count: Mapped[int]
 
 
 class Prompt(Base):
@@ -496,19 +680,30 @@ class Prompt(Base):
     __table_args__ = (
         UniqueConstraint("slug", "version", name="uq_prompts_slug_version"),
     )
+    __mapper_args__ = {"eager_defaults": True}
 
     id: Mapped[int] = mapped_column(BIGINT_PK, primary_key=True, autoincrement=True)
     slug: Mapped[str] = mapped_column(String(120), nullable=False)
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     description: Mapped[str | None] = mapped_column(Text)
     category: Mapped[PromptCategory] = mapped_column(
-        Enum(PromptCategory, name="prompt_category", native_enum=False),
+        Enum(
+            PromptCategory,
+            name="prompt_category",
+            native_enum=False,
+            values_callable=_enum_values,
+        ),
         nullable=False,
         default=PromptCategory.GENERIC,
         server_default=text("'generic'"),
     )
     source: Mapped[PromptSource] = mapped_column(
-        Enum(PromptSource, name="prompt_source", native_enum=False),
+        Enum(
+            PromptSource,
+            name="prompt_source",
+            native_enum=False,
+            values_callable=_enum_values,
+        ),
         nullable=False,
         default=PromptSource.SYSTEM,
         server_default=text("'system'"),
@@ -517,28 +712,29 @@ class Prompt(Base):
         Integer, nullable=False, default=1, server_default=text("1")
     )
     parameters_schema: Mapped[JSONDict] = mapped_column(
-        JSON, nullable=False, default=dict, server_default=text("'{}'")
+        JSONDocument, nullable=False, default=dict, server_default=text("'{}'")
     )
     parameters: Mapped[JSONDict] = mapped_column(
-        JSON, nullable=False, default=dict, server_default=text("'{}'")
+        JSONDocument, nullable=False, default=dict, server_default=text("'{}'")
     )
     is_active: Mapped[bool] = mapped_column(
         Boolean, nullable=False, default=True, server_default=text("1")
     )
     preview_asset_url: Mapped[str | None] = mapped_column(String(2048))
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), nullable=False, server_default=func.now()
+        DateTime(timezone=True), nullable=False, server_default=func.current_timestamp()
     )
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
-        server_default=func.now(),
-        onupdate=func.now(),
+        server_default=func.current_timestamp(),
+        onupdate=func.current_timestamp(),
     )
 
     tasks: Mapped[list[GenerationTask]] = relationship(
         back_populates="prompt",
         passive_deletes=True,
+        lazy="raise_on_sql",
     )
 
 
@@ -546,8 +742,11 @@ class GenerationTask(Base):
     """Tracks the lifecycle and artifacts of a generation request."""
 
     __tablename__ = "generation_tasks"
+    __mapper_args__ = {"eager_defaults": True}
 
-    id: Mapped[int] = mapped_column(BIGINT_PK, primary_key=True, autoincrement=True)
+    id: Mapped[int] = mapped_column(
+        BIGINT_PK, Identity(start=1, cache=ID_CACHE_SIZE), primary_key=True
+    )
     user_id: Mapped[int] = mapped_column(
         ForeignKey("users.id", ondelete="CASCADE"), nullable=False
     )
@@ -559,23 +758,28 @@ class GenerationTask(Base):
             GenerationTaskStatus,
             name="generation_task_status",
             native_enum=False,
-            values_callable=_generation_status_values,
+            values_callable=_enum_values,
         ),
         nullable=False,
         default=GenerationTaskStatus.PENDING,
         server_default=text("'pending'"),
     )
     source: Mapped[GenerationTaskSource] = mapped_column(
-        Enum(GenerationTaskSource, name="generation_task_source", native_enum=False),
+        Enum(
+            GenerationTaskSource,
+            name="generation_task_source",
+            native_enum=False,
+            values_callable=_enum_values,
+        ),
         nullable=False,
         default=GenerationTaskSource.API,
         server_default=text("'api'"),
     )
     parameters: Mapped[JSONDict] = mapped_column(
-        JSON, nullable=False, default=dict, server_default=text("'{}'")
+        JSONDocument, nullable=False, default=dict, server_default=text("'{}'")
     )
     result_parameters: Mapped[JSONDict] = mapped_column(
-        JSON, nullable=False, default=dict, server_default=text("'{}'")
+        JSONDocument, nullable=False, default=dict, server_default=text("'{}'")
     )
     input_asset_url: Mapped[str | None] = mapped_column(String(2048))
     result_asset_url: Mapped[str | None] = mapped_column(String(2048))
@@ -584,22 +788,32 @@ class GenerationTask(Base):
     started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
     completed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), nullable=False, server_default=func.now()
+        DateTime(timezone=True), nullable=False, server_default=func.current_timestamp()
     )
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
-        server_default=func.now(),
-        onupdate=func.now(),
+        server_default=func.current_timestamp(),
+        onupdate=func.current_timestamp(),
     )
 
-    prompt: Mapped[Prompt] = relationship(back_populates="tasks")
-    user: Mapped[User] = relationship(back_populates="generation_tasks")
+    prompt: Mapped[Prompt] = relationship(back_populates="tasks", lazy="raise_on_sql")
+    user: Mapped[User] = relationship(
+        back_populates="generation_tasks", lazy="raise_on_sql"
+    )
 
 
 Index("ix_prompts_slug", Prompt.slug)
 Index("ix_prompts_category", Prompt.category)
 Index("ix_prompts_slug_active", Prompt.slug, Prompt.is_active)
+# At most one version of a slug is live; deactivation seeks a single entry.
+Index(
+    "uq_prompts_active_per_slug",
+    Prompt.slug,
+    unique=True,
+    sqlite_where=text("is_active"),
+    postgresql_where=text("is_active"),
+)
 Index(
     "ix_prompts_slug_version_desc",
     Prompt.slug,
@@ -1,20 +1,41 @@
 from __future__ import annotations
 
-import asyncio
-import sqlite3
-from collections import defaultdict
-from collections.abc import Awaitable, Callable
-from contextlib import suppress
-from datetime import UTC, datetime
+import time
+from collections.abc import AsyncIterator, Iterable, Mapping, Sequence
+from contextlib import asynccontextmanager
 from decimal import ROUND_HALF_UP, Decimal
+from enum import StrEnum
+from types import MappingProxyType
 from typing import Any, TypeVar
-
-from jsonschema import Draft202012Validator
-from sqlalchemy import bindparam, func, select, update
-from sqlalchemy.exc import IntegrityError, OperationalError
+from weakref import WeakKeyDictionary
+
+from sqlalchemy import (
+    Connection,
+    Delete,
+    Engine,
+    Insert,
+    Select,
+    Update,
+    bindparam,
+    event,
+    func,
+    insert,
+    inspect,
+    literal,
+    select,
+    text,
+    update,
+)
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
-from sqlalchemy.sql import Select
+from sqlalchemy.orm import (
+    aliased,
+    joinedload,
+    make_transient_to_detached,
+    selectinload,
+)
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.util import identity_key
 
 from .enums import (
     GenerationTaskSource,
@@ -35,6 +56,7 @@ from .models import (
     SubscriptionPlan,
     Transaction,
     User,
+    UserBalanceSnapshot,
     UserProfile,
     UserSession,
 )
@@ -52,19 +74,98 @@ from .schemas import (
     UserProfileUpdate,
     UserSessionCreate,
     UserUpdate,
+    utcnow,
+    validate_prompt_parameters,
 )
 
-_PROMPT_VERSION_MAX_RETRIES = 10
-_SQLITE_LOCK_ERROR_SUBSTRING = "locked"
-_SQLITE_LOCK_RETRY_DELAYS = (0.02, 0.05, 0.1, 0.2, 0.4)
-
-# Per-slug async locks to serialize prompt creation on the same slug.
-# This prevents SQLite "database is locked" errors during concurrent writes
-# by ensuring only one coroutine per slug enters the critical section at a time.
-# Postgres handles concurrency naturally, so this lock is benign there.
-_PROMPT_SLUG_LOCKS: dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+# Column values of recently read subscription plans, per engine and keyed by
+# plan id. UPDATE/DELETE statements against the table (ORM flushes and Core
+# DML alike) clear the cache and bump the version so in-flight reads of the
+# old row are not stored. Entries also expire after a short TTL, which bounds
+# staleness from writes this process cannot see (other workers, raw SQL).
+_PLAN_CACHE: WeakKeyDictionary[Engine, dict[int, tuple[float, dict[str, Any]]]] = (
+    WeakKeyDictionary()
+)
+_PLAN_CACHE_MAX_SIZE = 256
+_PLAN_CACHE_TTL = 30.0
+_PLAN_WRITE_FLAG = "subscription_plans_written"
+_plan_cache_version = 0
+
+# Rows ``iter_prompts`` fetches per round of its server-side cursor.
+PROMPT_STREAM_BATCH_SIZE = 200
+
+# Pending ledger rows a ``batch_transactions`` block lets queue before flushing.
+TRANSACTION_BATCH_SIZE = 100
+_TRANSACTION_BATCH_KEY = "transaction_batch"
+
+# Hot point lookups are built once; callers bind parameters per execution so
+# the statements skip construction and cache-key generation on every call.
+_USER_BY_ID = select(User).where(User.id == bindparam("user_id"))
+_USER_BY_EMAIL = select(User).where(User.email == bindparam("email"))
+_SESSION_BY_TOKEN = select(UserSession).where(
+    UserSession.session_token == bindparam("token")
+)
+_ACTIVE_SESSION_BY_TOKEN = _SESSION_BY_TOKEN.where(UserSession.revoked_at.is_(None))
+# Revocation and expiry match, stamp and return the session row in one statement.
+# The stamp is bound from utcnow() rather than CURRENT_TIMESTAMP, which is the
+# transaction start on PostgreSQL and whole seconds on SQLite.
+_STAMP_SESSION = (
+    update(UserSession)
+    .where(UserSession.session_token == bindparam("token"))
+    .returning(UserSession)
+    .execution_options(populate_existing=True, synchronize_session=False)
+)
+_REVOKE_SESSION = _STAMP_SESSION.where(UserSession.revoked_at.is_(None)).values(
+    revoked_at=bindparam("now")
+)
+_EXPIRE_SESSION = _STAMP_SESSION.values(ended_at=bindparam("now"))
+_PROFILE_BY_USER_ID = select(UserProfile).where(
+    UserProfile.user_id == bindparam("user_id")
+)
+_SUBSCRIPTION_BY_ID = select(Subscription).where(
+    Subscription.id == bindparam("subscription_id")
+)
+_GENERATION_TASK_BY_ID = select(GenerationTask).where(
+    GenerationTask.id == bindparam("task_id")
+)
+_PROMPT_BY_ID = select(Prompt).where(Prompt.id == bindparam("prompt_id"))
+_PROMPT_BY_SLUG_VERSION = select(Prompt).where(
+    Prompt.slug == bindparam("slug"), Prompt.version == bindparam("version")
+)
+_LATEST_PROMPT_BY_SLUG = (
+    select(Prompt)
+    .where(Prompt.slug == bindparam("slug"))
+    .order_by(Prompt.version.desc())
+    .limit(1)
+)
+_LATEST_ACTIVE_PROMPT_BY_SLUG = _LATEST_PROMPT_BY_SLUG.where(Prompt.is_active.is_(True))
 
 T = TypeVar("T")
+E = TypeVar("E", bound=StrEnum)
+
+
+def _member_lookup(enum_type: type[E]) -> Mapping[str, E]:
+    # StrEnum members hash and compare like their values, so the table also
+    # resolves a member that is passed in as-is.
+    return MappingProxyType({member.value: member for member in enum_type})
+
+
+# Value -> member tables for the enum casts on the create paths; a dict hit
+# skips the EnumType.__call__ machinery.
+_SUBSCRIPTION_TIERS = _member_lookup(SubscriptionTier)
+_SUBSCRIPTION_STATUSES = _member_lookup(SubscriptionStatus)
+_PAYMENT_STATUSES = _member_lookup(PaymentStatus)
+_TRANSACTION_TYPES = _member_lookup(TransactionType)
+_PROMPT_SOURCES = _member_lookup(PromptSource)
+_PROMPT_CATEGORIES = _member_lookup(PromptCategory)
+_GENERATION_TASK_SOURCES = _member_lookup(GenerationTaskSource)
+
+
+def _enum_member(lookup: Mapping[str, E], value: str) -> E:
+    try:
+        return lookup[value]
+    except KeyError:
+        raise ValueError(f"{value!r} is not a valid option") from None
 
 
 class TelegramIdConflictError(Exception):
@@ -73,16 +174,52 @@ class TelegramIdConflictError(Exception):
     pass
 
 
+async def _update_returning(session: AsyncSession, instance: T, **values: Any) -> T:
+    """UPDATE ``instance``'s row with ``values`` and reload it from RETURNING.
+
+    Used by the lifecycle transitions so one statement writes the change and
+    brings back server-maintained columns such as ``updated_at``, which a plain
+    flush would expire and need another SELECT to read.
+    """
+
+    mapper = inspect(instance).mapper
+    identity = zip(
+        mapper.primary_key, mapper.primary_key_from_instance(instance), strict=True
+    )
+    stmt = (
+        update(mapper)
+        .where(*(column == value for column, value in identity))
+        .values(**values)
+        .returning(mapper)
+        .execution_options(populate_existing=True, synchronize_session=False)
+    )
+    result = await session.execute(stmt)
+    return result.scalar_one()
+
+
 async def create_user(session: AsyncSession, data: UserCreate) -> User:
     """Persist a new :class:`User` instance."""
 
-    user = User(**data.model_dump())
+    user = User(**dict(data))
     session.add(user)
     await session.flush()
-    await session.refresh(user)
     return user
 
 
+async def bulk_create_users(
+    session: AsyncSession, items: Sequence[UserCreate]
+) -> list[int]:
+    """Insert many users with one batched INSERT, returning their ids."""
+
+    if not items:
+        return []
+    result = await session.execute(
+        insert(User).returning(User.id, sort_by_parameter_order=True),
+        [dict(item) for item in items],
+    )
+    return list(result.scalars())
+
+
 async def update_user(session: AsyncSession, user: User, data: UserUpdate) -> User:
     """Update mutable fields for a user instance."""
 
@@ -90,13 +227,11 @@ async def update_user(session: AsyncSession, user: User, data: UserUpdate) -> Us
     for key, value in updates.items():
         setattr(user, key, value)
     await session.flush()
-    await session.refresh(user)
     return user
 
 
 async def get_user_by_id(session: AsyncSession, user_id: int) -> User | None:
-    stmt = select(User).where(User.id == user_id)
-    result = await session.execute(stmt)
+    result = await session.execute(_USER_BY_ID, {"user_id": user_id})
     return result.scalar_one_or_none()
 
 
@@ -105,26 +240,41 @@ async def get_user_with_related(session: AsyncSession, user_id: int) -> User | N
         select(User)
         .options(
             joinedload(User.profile),
-            joinedload(User.sessions),
             joinedload(User.subscription_plan),
-            joinedload(User.subscriptions),
+            # Collections load in their own SELECT ... IN so the user row is not
+            # repeated once per session x subscription pair.
+            selectinload(User.sessions),
+            selectinload(User.subscriptions),
         )
         .where(User.id == user_id)
     )
     result = await session.execute(stmt)
-    return result.unique().scalar_one_or_none()
+    return result.scalar_one_or_none()
 
 
 async def get_user_by_email(session: AsyncSession, email: str) -> User | None:
-    stmt = select(User).where(User.email == email)
-    result = await session.execute(stmt)
+    result = await session.execute(_USER_BY_EMAIL, {"email": email})
     return result.scalar_one_or_none()
 
 
+def _sync_user_balance(
+    session: AsyncSession, user_id: int, balance: Decimal, updated_at: Any
+) -> None:
+    # Keep an already loaded user in step with the UPDATE so callers holding
+    # it do not need a refresh.
+    user = session.sync_session.identity_map.get(identity_key(User, user_id))
+    if user is not None:
+        set_committed_value(user, "balance", balance)
+        set_committed_value(user, "updated_at", updated_at)
+
+
 async def adjust_user_balance(
     session: AsyncSession, user_id: int, delta: Decimal
 ) -> Decimal:
-    """Atomically adjust a user's balance by a delta amount."""
+    """Atomically adjust a user's balance by a delta amount.
+
+    A copy of the user already loaded in *session* is updated in place.
+    """
 
     quantized_delta = Decimal(delta).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
     zero = Decimal("0")
@@ -135,13 +285,30 @@ async def adjust_user_balance(
         .where(User.id == user_id)
         .where((User.balance + delta_param) >= zero)
         .values(balance=User.balance + delta_param)
-        .returning(User.balance)
+        .returning(User.balance, User.updated_at)
     )
 
+    if _is_postgresql_session(session):
+        # One round-trip: the UPDATE runs as a CTE next to an existence probe,
+        # so a rejected adjustment still knows which error to raise.
+        adjusted = stmt.cte("adjusted")
+        combined = select(
+            select(User.id).where(User.id == user_id).exists().label("user_exists"),
+            select(adjusted.c.balance).scalar_subquery().label("new_balance"),
+            select(adjusted.c.updated_at).scalar_subquery().label("updated_at"),
+        )
+        row = (await session.execute(combined, {"delta": quantized_delta})).one()
+        if row.new_balance is None:
+            if not row.user_exists:
+                raise ValueError("user not found")
+            raise ValueError("balance cannot be negative")
+        _sync_user_balance(session, user_id, row.new_balance, row.updated_at)
+        return row.new_balance
+
     result = await session.execute(stmt, {"delta": quantized_delta})
-    new_balance = result.scalar_one_or_none()
+    row = result.one_or_none()
 
-    if new_balance is None:
+    if row is None:
         # Check if user exists to determine the error
         exists_stmt = select(User.id).where(User.id == user_id)
         exists_result = await session.execute(exists_stmt)
@@ -149,13 +316,12 @@ async def adjust_user_balance(
             raise ValueError("user not found")
         raise ValueError("balance cannot be negative")
 
-    return new_balance
+    _sync_user_balance(session, user_id, row.balance, row.updated_at)
+    return row.balance
 
 
 async def soft_delete_user(session: AsyncSession, user: User) -> User:
-    user.deleted_at = datetime.now(UTC)
-    await session.flush()
-    return user
+    return await _update_returning(session, user, deleted_at=utcnow())
 
 
 async def hard_delete_user(session: AsyncSession, user: User) -> None:
@@ -176,23 +342,105 @@ async def create_subscription_plan(
     )
     session.add(plan)
     await session.flush()
-    await session.refresh(plan)
     return plan
 
 
-async def create_profile(session: AsyncSession, data: UserProfileCreate) -> UserProfile:
-    # Check telegram_id uniqueness if provided
-    if data.telegram_id is not None:
-        is_unique = await check_telegram_id_uniqueness(session, data.telegram_id)
-        if not is_unique:
+def _invalidate_plan_cache() -> None:
+    global _plan_cache_version
+    _plan_cache_version += 1
+    _PLAN_CACHE.clear()
+
+
+@event.listens_for(Engine, "before_execute")
+def _on_plan_dml(
+    conn: Connection,
+    clauseelement: Any,
+    multiparams: Any,
+    params: Any,
+    execution_options: Any,
+) -> None:
+    if not isinstance(clauseelement, Update | Delete):
+        return
+    if getattr(clauseelement.table, "name", None) != SubscriptionPlan.__tablename__:
+        return
+    _invalidate_plan_cache()
+    # Other sessions may cache the old row until this write commits, so the
+    # writing connection invalidates once more when its transaction ends.
+    conn.info[_PLAN_WRITE_FLAG] = True
+
+
+@event.listens_for(Engine, "commit")
+@event.listens_for(Engine, "rollback")
+def _on_transaction_end(conn: Connection) -> None:
+    if conn.info.pop(_PLAN_WRITE_FLAG, False):
+        _invalidate_plan_cache()
+
+
+async def get_subscription_plan(
+    session: AsyncSession, plan_id: int
+) -> SubscriptionPlan | None:
+    """Return a subscription plan, serving repeat lookups from memory.
+
+    Cached column values are kept per engine for ``_PLAN_CACHE_TTL`` seconds
+    and merged into *session* without a SELECT. Rows read while a concurrent
+    write bumped the cache version are returned but not cached.
+    """
+    sync_session = session.sync_session
+    engine = session.get_bind().engine
+    if identity_key(SubscriptionPlan, plan_id) not in sync_session.identity_map:
+        entry = _PLAN_CACHE.get(engine, {}).get(plan_id)
+        if entry is not None and entry[0] > time.monotonic():
+            plan = SubscriptionPlan(**entry[1])
+            make_transient_to_detached(plan)
+            return await session.merge(plan, load=False)
+
+    version = _plan_cache_version
+    plan = await session.get(SubscriptionPlan, plan_id)
+    if plan is None or version != _plan_cache_version:
+        return plan
+
+    state = inspect(plan)
+    keys = [attr.key for attr in state.mapper.column_attrs]
+    if not state.modified and all(key in state.dict for key in keys):
+        plans = _PLAN_CACHE.setdefault(engine, {})
+        if len(plans) >= _PLAN_CACHE_MAX_SIZE:
+            plans.clear()
+        plans[plan_id] = (
+            time.monotonic() + _PLAN_CACHE_TTL,
+            {key: state.dict[key] for key in keys},
+        )
+    return plan
+
+
+def _is_telegram_id_conflict(error: IntegrityError) -> bool:
+    message = str(getattr(error, "orig", error)).lower()
+    return (
+        "uq_user_profiles_telegram_id" in message
+        or "user_profiles.telegram_id" in message
+    )
+
+
+async def _flush_profile(session: AsyncSession, telegram_id: int | None) -> None:
+    """Flush profile changes, surfacing a taken telegram_id as a domain error.
+
+    The unique constraint is the only check, so a conflict leaves the session
+    needing a rollback like any other failed flush.
+    """
+
+    try:
+        await session.flush()
+    except IntegrityError as exc:
+        if _is_telegram_id_conflict(exc):
             raise TelegramIdConflictError(
-                f"telegram_id {data.telegram_id} is already in use"
-            )
+                f"telegram_id {telegram_id} is already in use"
+            ) from exc
+        raise
+
 
-    profile = UserProfile(**data.model_dump())
+async def create_profile(session: AsyncSession, data: UserProfileCreate) -> UserProfile:
+    profile = UserProfile(**dict(data))
     session.add(profile)
-    await session.flush()
-    await session.refresh(profile)
+    await _flush_profile(session, data.telegram_id)
     return profile
 
 
@@ -201,28 +449,16 @@ async def update_profile(
 ) -> UserProfile:
     updates = data.model_dump(exclude_unset=True)
 
-    # Check telegram_id uniqueness if being updated
-    if "telegram_id" in updates and updates["telegram_id"] is not None:
-        is_unique = await check_telegram_id_uniqueness(
-            session, updates["telegram_id"], exclude_user_id=profile.user_id
-        )
-        if not is_unique:
-            raise TelegramIdConflictError(
-                f"telegram_id {updates['telegram_id']} is already in use"
-            )
-
     for key, value in updates.items():
         setattr(profile, key, value)
-    await session.flush()
-    await session.refresh(profile)
+    await _flush_profile(session, updates.get("telegram_id"))
     return profile
 
 
 async def get_profile_by_user_id(
     session: AsyncSession, user_id: int
 ) -> UserProfile | None:
-    stmt = select(UserProfile).where(UserProfile.user_id == user_id)
-    result = await session.execute(stmt)
+    result = await session.execute(_PROFILE_BY_USER_ID, {"user_id": user_id})
     return result.scalar_one_or_none()
 
 
@@ -239,63 +475,63 @@ async def check_telegram_id_uniqueness(
     Returns:
         True if the telegram_id is unique, False if it's already taken
     """
-    stmt = select(UserProfile).where(UserProfile.telegram_id == telegram_id)
+    stmt = select(UserProfile.id).where(UserProfile.telegram_id == telegram_id)
     if exclude_user_id is not None:
         stmt = stmt.where(UserProfile.user_id != exclude_user_id)
 
-    result = await session.execute(stmt)
-    existing_profile = result.scalar_one_or_none()
-    return existing_profile is None
+    result = await session.execute(stmt.limit(1))
+    return result.scalar_one_or_none() is None
 
 
 async def create_session(session: AsyncSession, data: UserSessionCreate) -> UserSession:
-    session_model = UserSession(**data.model_dump())
+    session_model = UserSession(**dict(data))
     session.add(session_model)
     await session.flush()
-    await session.refresh(session_model)
     return session_model
 
 
+async def bulk_create_sessions(
+    session: AsyncSession, items: Sequence[UserSessionCreate]
+) -> list[int]:
+    """Insert many user sessions with one batched INSERT, returning their ids."""
+
+    if not items:
+        return []
+    result = await session.execute(
+        insert(UserSession).returning(UserSession.id, sort_by_parameter_order=True),
+        [dict(item) for item in items],
+    )
+    return list(result.scalars())
+
+
 async def get_session_by_token(session: AsyncSession, token: str) -> UserSession | None:
-    stmt = select(UserSession).where(UserSession.session_token == token)
-    result = await session.execute(stmt)
+    result = await session.execute(_SESSION_BY_TOKEN, {"token": token})
     return result.scalar_one_or_none()
 
 
 async def get_active_session_by_token(
     session: AsyncSession, token: str
 ) -> UserSession | None:
-    stmt = select(UserSession).where(
-        UserSession.session_token == token, UserSession.revoked_at.is_(None)
-    )
-    result = await session.execute(stmt)
+    result = await session.execute(_ACTIVE_SESSION_BY_TOKEN, {"token": token})
     return result.scalar_one_or_none()
 
 
 async def revoke_session(
     session: AsyncSession, session_token: str
 ) -> UserSession | None:
-    user_session = await get_active_session_by_token(session, session_token)
-    if user_session is None:
-        return None
-    user_session.revoked_at = datetime.now(UTC)
-    await session.flush()
-    await session.refresh(user_session)
-    return user_session
+    result = await session.execute(
+        _REVOKE_SESSION, {"token": session_token, "now": utcnow()}
+    )
+    return result.scalar_one_or_none()
 
 
 async def expire_session(
     session: AsyncSession, session_token: str
 ) -> UserSession | None:
-    stmt = select(UserSession).where(UserSession.session_token == session_token)
-    result = await session.execute(stmt)
-    user_session = result.scalar_one_or_none()
-    if user_session is None:
-        return None
-    user_session.ended_at = datetime.now(UTC)
-    await session.flush()
-    await session.refresh(user_session)
-    return user_session
+    result = await session.execute(
+        _EXPIRE_SESSION, {"token": session_token, "now": utcnow()}
+    )
+    return result.scalar_one_or_none()
 
 
 async def create_subscription(
@@ -303,27 +539,44 @@ async def create_subscription(
 ) -> Subscription:
     """Persist a new subscription record for a user."""
 
-    payload = data.model_dump()
-    payload["tier"] = SubscriptionTier(payload["tier"])
-    payload["status"] = SubscriptionStatus(payload["status"])
-    payload["provider_data"] = dict(payload.get("provider_data") or {})
-    payload["metadata"] = dict(payload.get("metadata") or {})
+    payload = dict(data)
+    payload["tier"] = _enum_member(_SUBSCRIPTION_TIERS, payload["tier"])
+    payload["status"] = _enum_member(_SUBSCRIPTION_STATUSES, payload["status"])
 
     subscription = Subscription(**payload)
     session.add(subscription)
     await session.flush()
-    await session.refresh(subscription)
     return subscription
 
 
 async def get_subscription_by_id(
     session: AsyncSession, subscription_id: int
 ) -> Subscription | None:
-    stmt = select(Subscription).where(Subscription.id == subscription_id)
-    result = await session.execute(stmt)
+    result = await session.execute(
+        _SUBSCRIPTION_BY_ID, {"subscription_id": subscription_id}
+    )
     return result.scalar_one_or_none()
 
 
+def _subscription_history_values(
+    subscription: Subscription, *, reason: str | None
+) -> dict[str, Any]:
+    return {
+        "subscription_id": subscription.id,
+        "tier": subscription.tier,
+        "status": subscription.status,
+        "auto_renew": subscription.auto_renew,
+        "quota_limit": subscription.quota_limit,
+        "quota_used": subscription.quota_used,
+        "provider_subscription_id": subscription.provider_subscription_id,
+        "provider_data": dict(subscription.provider_data or {}),
+        "meta_data": dict(subscription.meta_data),
+        "current_period_start": subscription.current_period_start,
+        "current_period_end": subscription.current_period_end,
+        "reason": reason,
+    }
+
+
 async def create_subscription_history_snapshot(
     session: AsyncSession,
     subscription: Subscription,
@@ -333,25 +586,36 @@ async def create_subscription_history_snapshot(
     """Capture the current state of a subscription in the history table."""
 
     snapshot = SubscriptionHistory(
-        subscription_id=subscription.id,
-        tier=subscription.tier,
-        status=subscription.status,
-        auto_renew=subscription.auto_renew,
-        quota_limit=subscription.quota_limit,
-        quota_used=subscription.quota_used,
-        provider_subscription_id=subscription.provider_subscription_id,
-        provider_data=dict(subscription.provider_data or {}),
-        metadata=dict(subscription.metadata_dict),
-        current_period_start=subscription.current_period_start,
-        current_period_end=subscription.current_period_end,
-        reason=reason,
+        **_subscription_history_values(subscription, reason=reason)
     )
     session.add(snapshot)
     await session.flush()
-    await session.refresh(snapshot)
     return snapshot
 
 
+async def bulk_create_subscription_history_snapshots(
+    session: AsyncSession,
+    subscriptions: Iterable[Subscription],
+    *,
+    reason: str | None = None,
+) -> list[int]:
+    """Snapshot many subscriptions with one batched INSERT, returning new ids."""
+
+    rows = [
+        _subscription_history_values(subscription, reason=reason)
+        for subscription in subscriptions
+    ]
+    if not rows:
+        return []
+    result = await session.execute(
+        insert(SubscriptionHistory).returning(
+            SubscriptionHistory.id, sort_by_parameter_order=True
+        ),
+        rows,
+    )
+    return list(result.scalars())
+
+
 async def increment_subscription_usage(
     session: AsyncSession, subscription: Subscription, amount: int
 ) -> Subscription:
@@ -364,7 +628,6 @@ async def increment_subscription_usage(
         raise ValueError("quota usage exceeds configured limit")
     subscription.quota_used = updated
     await session.flush()
-    await session.refresh(subscription)
     return subscription
 
 
@@ -380,7 +643,6 @@ async def decrement_subscription_usage(
         updated = 0
     subscription.quota_used = updated
     await session.flush()
-    await session.refresh(subscription)
     return subscription
 
 
@@ -401,38 +663,125 @@ async def get_active_subscription_for_user(
     return result.scalars().first()
 
 
+def _payment_values(data: PaymentCreate) -> dict[str, Any]:
+    payload = dict(data)
+    payload["status"] = _enum_member(_PAYMENT_STATUSES, payload["status"])
+    payload["meta_data"] = payload.pop("metadata")
+    return payload
+
+
 async def create_payment(session: AsyncSession, data: PaymentCreate) -> Payment:
-    payload = data.model_dump()
-    payload["status"] = PaymentStatus(payload["status"])
-    payload["provider_data"] = dict(payload.get("provider_data") or {})
-    payload["metadata"] = dict(payload.get("metadata") or {})
-    payment = Payment(**payload)
+    payment = Payment(**_payment_values(data))
     session.add(payment)
     await session.flush()
-    await session.refresh(payment)
     return payment
 
 
+async def bulk_create_payments(
+    session: AsyncSession, items: Sequence[PaymentCreate]
+) -> list[int]:
+    """Insert many payments with one batched INSERT, returning their ids."""
+
+    if not items:
+        return []
+    result = await session.execute(
+        insert(Payment).returning(Payment.id, sort_by_parameter_order=True),
+        [_payment_values(item) for item in items],
+    )
+    return list(result.scalars())
+
+
+def _transaction_values(payment_id: int, data: TransactionCreate) -> dict[str, Any]:
+    payload = dict(data)
+    payload["payment_id"] = payment_id
+    payload["type"] = _enum_member(_TRANSACTION_TYPES, payload["type"])
+    payload["meta_data"] = payload.pop("metadata")
+    return payload
+
+
+@asynccontextmanager
+async def batch_transactions(session: AsyncSession) -> AsyncIterator[None]:
+    """Hold back ``create_transaction`` flushes so queued rows share one INSERT.
+
+    Transactions created inside the block stay pending, and get their ids, until
+    the block exits or ``TRANSACTION_BATCH_SIZE`` of them are queued. Nested
+    blocks join the outermost one.
+    """
+
+    if _TRANSACTION_BATCH_KEY in session.info:
+        yield
+        return
+    session.info[_TRANSACTION_BATCH_KEY] = 0
+    try:
+        yield
+        await session.flush()
+    finally:
+        session.info.pop(_TRANSACTION_BATCH_KEY, None)
+
+
 async def create_transaction(
     session: AsyncSession, *, payment_id: int, data: TransactionCreate
 ) -> Transaction:
-    payload = data.model_dump()
-    payload["payment_id"] = payment_id
-    payload["type"] = TransactionType(payload["type"])
-    payload["metadata"] = dict(payload.get("metadata") or {})
-    transaction = Transaction(**payload)
+    transaction = Transaction(**_transaction_values(payment_id, data))
     session.add(transaction)
+    queued = session.info.get(_TRANSACTION_BATCH_KEY)
+    if queued is not None and queued + 1 < TRANSACTION_BATCH_SIZE:
+        session.info[_TRANSACTION_BATCH_KEY] = queued + 1
+        return transaction
     await session.flush()
-    await session.refresh(transaction)
+    if queued is not None:
+        session.info[_TRANSACTION_BATCH_KEY] = 0
     return transaction
 
 
+async def bulk_create_transactions(
+    session: AsyncSession, *, payment_id: int, items: Sequence[TransactionCreate]
+) -> list[int]:
+    """Insert ledger entries for one payment in a batched INSERT, returning ids."""
+
+    if not items:
+        return []
+    result = await session.execute(
+        insert(Transaction).returning(Transaction.id, sort_by_parameter_order=True),
+        [_transaction_values(payment_id, item) for item in items],
+    )
+    return list(result.scalars())
+
+
+async def get_user_balance_snapshot(
+    session: AsyncSession, user_id: int
+) -> UserBalanceSnapshot | None:
+    """Return the precomputed ledger totals for a user, if they have any.
+
+    On PostgreSQL the totals come from a materialized view and only reflect
+    ledger rows written before the last :func:`refresh_user_balance_snapshot`.
+    Nothing refreshes it automatically; billing jobs must call it after they
+    write transactions.
+    """
+
+    return await session.get(UserBalanceSnapshot, user_id)
+
+
+async def refresh_user_balance_snapshot(session: AsyncSession) -> None:
+    """Recompute ``user_balance_snapshot`` after large billing runs.
+
+    Only PostgreSQL materializes the view; elsewhere it is a plain view and is
+    always current.
+    """
+
+    if not _is_postgresql_session(session):
+        return
+    await session.execute(
+        text("REFRESH MATERIALIZED VIEW CONCURRENTLY user_balance_snapshot")
+    )
+
+
 def _coerce_category(value: PromptCategory | str | None) -> PromptCategory | None:
     if value is None:
         return None
     if isinstance(value, PromptCategory):
         return value
-    return PromptCategory(str(value))
+    return _enum_member(_PROMPT_CATEGORIES, str(value))
 
 
 def _prompt_dict(value: Any | None) -> dict[str, Any]:
@@ -441,194 +790,105 @@ def _prompt_dict(value: Any | None) -> dict[str, Any]:
     return dict(value)
 
 
-def _validate_prompt_parameters(
-    parameters: dict[str, Any], schema: dict[str, Any]
-) -> None:
-    validator = Draft202012Validator(schema)
-    error = next(validator.iter_errors(parameters), None)
-    if error is not None:
-        raise ValueError(f"parameters do not conform to schema: {error.message}")
-
-
-def _supports_select_for_update(session: AsyncSession) -> bool:
+def _is_sqlite_session(session: AsyncSession) -> bool:
     bind = session.bind
     if bind is None:
         return False
-    return bind.dialect.name not in {"sqlite"}
+    return bind.dialect.name == "sqlite"
 
 
-def _is_sqlite_session(session: AsyncSession) -> bool:
+def _is_postgresql_session(session: AsyncSession) -> bool:
     bind = session.bind
     if bind is None:
         return False
-    return bind.dialect.name == "sqlite"
-
+    return bind.dialect.name == "postgresql"
 
-def _is_sqlite_database_locked_error(error: OperationalError) -> bool:
-    orig = getattr(error, "orig", None)
-    if not isinstance(orig, sqlite3.OperationalError):
-        return False
-    message = str(error).lower()
-    if _SQLITE_LOCK_ERROR_SUBSTRING in message:
-        return True
-    if orig is not None and _SQLITE_LOCK_ERROR_SUBSTRING in str(orig).lower():
-        return True
-    return False
 
+def _insert_next_prompt_version(payload: dict[str, Any]) -> Insert:
+    """INSERT ... SELECT the payload with the slug's next version number."""
 
-async def _run_with_sqlite_retry(
-    session: AsyncSession,
-    operation: Callable[[], Awaitable[T]],
-) -> T:
-    if not _is_sqlite_session(session):
-        return await operation()
-
-    delays = _SQLITE_LOCK_RETRY_DELAYS
-    for attempt, delay in enumerate(delays):
-        try:
-            return await operation()
-        except OperationalError as exc:
-            if not _is_sqlite_database_locked_error(exc):
-                raise
-            if attempt == len(delays) - 1:
-                raise
-            await asyncio.sleep(delay)
-
-    raise RuntimeError("sqlite retry loop exhausted without result")
-
-
-def _latest_prompt_select(
-    slug: str, *, active_only: bool = True
-) -> Select[tuple[Prompt]]:
-    stmt = select(Prompt).where(Prompt.slug == slug)
-    if active_only:
-        stmt = stmt.where(Prompt.is_active.is_(True))
-    return stmt.order_by(Prompt.version.desc()).limit(1)
-
-
-async def _next_prompt_version(
-    session: AsyncSession,
-    slug: str,
-    *,
-    lock: bool,
-) -> int:
-    stmt = (
-        select(Prompt.version)
-        .where(Prompt.slug == slug)
-        .order_by(Prompt.version.desc())
-        .limit(1)
-    )
-    if lock:
-        stmt = stmt.with_for_update()
-    result = await session.execute(stmt)
-    current = result.scalar_one_or_none()
-    return int((current or 0) + 1)
-
-
-def _is_prompt_version_conflict(error: IntegrityError) -> bool:
-    message = str(getattr(error, "orig", error)).lower()
+    prompts_table = Prompt.__table__
+    next_version = select(
+        *(literal(value, prompts_table.c[key].type) for key, value in payload.items()),
+        func.coalesce(func.max(prompts_table.c.version), 0) + 1,
+    ).where(prompts_table.c.slug == payload["slug"])
     return (
-        "uq_prompts_slug_version" in message
-        or "prompts.slug, prompts.version" in message
-        or (
-            "prompts" in message
-            and "slug" in message
-            and "version" in message
-            and "unique" in message
-        )
+        insert(Prompt)
+        .from_select([*payload, "version"], next_version)
+        .returning(Prompt)
     )
 
 
 async def _deactivate_existing_active_versions(
     session: AsyncSession, slug: str, *, exclude_id: int | None = None
-) -> None:
+) -> int | None:
+    """Deactivate the live version of ``slug`` and return its id, if any.
+
+    ``uq_prompts_active_per_slug`` allows one live version per slug, so this
+    touches at most one row.
+    """
+
     prompts_table = Prompt.__table__
     stmt = (
         update(prompts_table)  # type: ignore[arg-type]
         .where(prompts_table.c.slug == bindparam("b_slug"))
         .where(prompts_table.c.is_active.is_(True))
         .values(is_active=False, updated_at=func.current_timestamp())
+        .returning(prompts_table.c.id)
     )
     params: dict[str, Any] = {"b_slug": slug}
     if exclude_id is not None:
         stmt = stmt.where(prompts_table.c.id != bindparam("b_exclude_id"))
         params["b_exclude_id"] = exclude_id
-    await session.execute(stmt, params)
+    result = await session.execute(stmt, params)
+    return result.scalar_one_or_none()
 
 
-def _get_slug_lock(slug: str) -> asyncio.Lock:
-    """Return the async lock for the given prompt slug.
+async def _begin_immediate(session: AsyncSession) -> None:
+    """Take the SQLite write lock before the prompt version is read.
 
-    Lazily creates a lock per slug to serialize concurrent writes on the same slug.
-    This prevents SQLite "database is locked" errors during concurrent prompt creation.
-    For Postgres, this lock is benign as the database handles concurrency naturally.
+    pysqlite only opens a transaction ahead of DML, so the version read would
+    otherwise see a snapshot that a concurrent writer can commit past.
     """
-    return _PROMPT_SLUG_LOCKS[slug]
+
+    connection = await session.connection()
+    raw_connection = await connection.get_raw_connection()
+    if not raw_connection.driver_connection.in_transaction:
+        await connection.exec_driver_sql("BEGIN IMMEDIATE")
 
 
 async def create_prompt(session: AsyncSession, data: PromptCreate) -> Prompt:
     """Persist a prompt template definition."""
 
-    payload = data.model_dump()
+    payload = dict(data)
     slug = payload["slug"]
     category = _coerce_category(payload.get("category")) or PromptCategory.GENERIC
     schema = _prompt_dict(payload.get("parameters_schema"))
     parameters = _prompt_dict(payload.get("parameters"))
     is_active = bool(payload.get("is_active", True))
 
-    _validate_prompt_parameters(parameters, schema)
+    validate_prompt_parameters(parameters, schema)
 
     payload["category"] = category
-    payload["source"] = PromptSource(payload["source"])
+    payload["source"] = _enum_member(_PROMPT_SOURCES, payload["source"])
     payload["parameters_schema"] = schema
     payload["parameters"] = parameters
     payload["is_active"] = is_active
     payload.pop("version", None)
 
-    lock_for_update = _supports_select_for_update(session)
-
-    # Acquire per-slug lock to serialize concurrent writes on the same slug.
-    # This prevents SQLite "database is locked" errors during concurrent prompt creation
-    # by ensuring only one coroutine per slug enters the critical section at a time.
-    # The lock is benign for Postgres, which handles concurrency naturally.
-    async with _get_slug_lock(slug):
-        prompt: Prompt | None = None
-        last_error: IntegrityError | None = None
-
-        for _ in range(_PROMPT_VERSION_MAX_RETRIES):
-
-            async def _persist_candidate() -> Prompt:
-                async with session.begin_nested():
-                    version = await _next_prompt_version(
-                        session,
-                        slug,
-                        lock=lock_for_update,
-                    )
-                    if is_active:
-                        await _deactivate_existing_active_versions(session, slug)
-                    candidate = Prompt(**payload, version=version)
-                    session.add(candidate)
-                    try:
-                        await session.flush()
-                    except Exception:
-                        with suppress(Exception):
-                            session.expunge(candidate)
-                        raise
-                return candidate
-
-            try:
-                prompt = await _run_with_sqlite_retry(session, _persist_candidate)
-                break
-            except IntegrityError as exc:
-                last_error = exc
-                if _is_prompt_version_conflict(exc):
-                    continue
-                raise
-        else:
-            raise ValueError("failed to persist prompt version") from last_error
-
-        await session.refresh(prompt)
-        return prompt
+    if _is_postgresql_session(session):
+        # Queue concurrent writers of the slug for the rest of the transaction so
+        # they cannot compute the same version.
+        await session.execute(select(func.pg_advisory_xact_lock(func.hashtext(slug))))
+    elif _is_sqlite_session(session):
+        await _begin_immediate(session)
+    if is_active:
+        # Runs as its own statement: PostgreSQL would apply an unreferenced
+        # data-modifying CTE after the insert, tripping the live-version index.
+        await _deactivate_existing_active_versions(session, slug)
+
+    result = await session.scalars(_insert_next_prompt_version(payload))
+    return result.one()
 
 
 async def get_latest_prompt_by_slug(
@@ -637,11 +897,41 @@ async def get_latest_prompt_by_slug(
     *,
     active_only: bool = True,
 ) -> Prompt | None:
-    stmt = _latest_prompt_select(slug, active_only=active_only)
-    result = await session.execute(stmt)
+    stmt = _LATEST_ACTIVE_PROMPT_BY_SLUG if active_only else _LATEST_PROMPT_BY_SLUG
+    result = await session.execute(stmt, {"slug": slug})
     return result.scalar_one_or_none()
 
 
+async def get_latest_prompts_by_slugs(
+    session: AsyncSession,
+    slugs: Iterable[str],
+    *,
+    active_only: bool = True,
+) -> dict[str, Prompt]:
+    """Return the newest version of each slug, fetched in a single query.
+
+    Slugs without a matching prompt are absent from the result.
+    """
+
+    requested = list(dict.fromkeys(slugs))
+    if not requested:
+        return {}
+    ranked = select(
+        Prompt,
+        func.row_number()
+        .over(partition_by=Prompt.slug, order_by=Prompt.version.desc())
+        .label("version_rank"),
+    ).where(Prompt.slug.in_(requested))
+    if active_only:
+        ranked = ranked.where(Prompt.is_active.is_(True))
+    ranked_subquery = ranked.subquery()
+    latest = aliased(Prompt, ranked_subquery)
+    result = await session.execute(
+        select(latest).where(ranked_subquery.c.version_rank == 1)
+    )
+    return {prompt.slug: prompt for prompt in result.scalars()}
+
+
 async def get_prompt_by_slug(
     session: AsyncSession,
     slug: str,
@@ -650,11 +940,9 @@ async def get_prompt_by_slug(
     active_only: bool = True,
 ) -> Prompt | None:
     if version is not None:
-        stmt = select(Prompt).where(
-            Prompt.slug == slug,
-            Prompt.version == version,
+        result = await session.execute(
+            _PROMPT_BY_SLUG_VERSION, {"slug": slug, "version": version}
         )
-        result = await session.execute(stmt)
         return result.scalar_one_or_none()
     return await get_latest_prompt_by_slug(
         session,
@@ -663,26 +951,50 @@ async def get_prompt_by_slug(
     )
 
 
-async def list_prompts(
-    session: AsyncSession,
-    *,
-    category: PromptCategory | str | None = None,
-    active_only: bool = True,
-) -> list[Prompt]:
+def _prompts_select(
+    category: PromptCategory | str | None, *, active_only: bool
+) -> Select[tuple[Prompt]]:
     stmt = select(Prompt)
     if active_only:
         stmt = stmt.where(Prompt.is_active.is_(True))
     coerced_category = _coerce_category(category)
     if coerced_category is not None:
         stmt = stmt.where(Prompt.category == coerced_category)
-    stmt = stmt.order_by(Prompt.slug.asc(), Prompt.version.desc())
-    result = await session.execute(stmt)
+    return stmt.order_by(Prompt.slug.asc(), Prompt.version.desc())
+
+
+async def list_prompts(
+    session: AsyncSession,
+    *,
+    category: PromptCategory | str | None = None,
+    active_only: bool = True,
+) -> list[Prompt]:
+    result = await session.execute(_prompts_select(category, active_only=active_only))
     return list(result.scalars().all())
 
 
+async def iter_prompts(
+    session: AsyncSession,
+    *,
+    category: PromptCategory | str | None = None,
+    active_only: bool = True,
+) -> AsyncIterator[Prompt]:
+    """Stream the prompts :func:`list_prompts` would return.
+
+    Rows arrive in batches of ``PROMPT_STREAM_BATCH_SIZE`` from a server-side
+    cursor, so memory stays bounded however many prompts match.
+    """
+
+    stmt = _prompts_select(category, active_only=active_only).execution_options(
+        yield_per=PROMPT_STREAM_BATCH_SIZE
+    )
+    result = await session.stream_scalars(stmt)
+    async for prompt in result:
+        yield prompt
+
+
 async def get_prompt_by_id(session: AsyncSession, prompt_id: int) -> Prompt | None:
-    stmt = select(Prompt).where(Prompt.id == prompt_id)
-    result = await session.execute(stmt)
+    result = await session.execute(_PROMPT_BY_ID, {"prompt_id": prompt_id})
     return result.scalar_one_or_none()
 
 
@@ -692,7 +1004,6 @@ async def update_prompt(
     updates = data.model_dump(exclude_unset=True)
     if not updates:
         await session.flush()
-        await session.refresh(prompt)
         return prompt
 
     new_schema = (
@@ -706,7 +1017,7 @@ async def update_prompt(
 
     schema_after_update = new_schema or dict(prompt.parameters_schema or {})
     parameters_after_update = new_parameters or dict(prompt.parameters or {})
-    _validate_prompt_parameters(parameters_after_update, schema_after_update)
+    validate_prompt_parameters(parameters_after_update, schema_after_update)
 
     if "name" in updates:
         prompt.name = updates["name"]
@@ -719,7 +1030,7 @@ async def update_prompt(
     if "source" in updates:
         source_value = updates["source"]
         if source_value is not None:
-            prompt.source = PromptSource(source_value)
+            prompt.source = _enum_member(_PROMPT_SOURCES, source_value)
     if new_schema is not None:
         prompt.parameters_schema = new_schema
     if new_parameters is not None:
@@ -728,28 +1039,19 @@ async def update_prompt(
         prompt.preview_asset_url = updates["preview_asset_url"]
     if "is_active" in updates:
         active = bool(updates["is_active"])
-        prompt.is_active = active
         if active:
-
-            async def _deactivate_active_versions() -> None:
-                async with session.begin_nested():
-                    await _deactivate_existing_active_versions(
-                        session, prompt.slug, exclude_id=prompt.id
-                    )
-
-            await _run_with_sqlite_retry(session, _deactivate_active_versions)
+            # Retire the live version before this one is flushed as active.
+            await _deactivate_existing_active_versions(
+                session, prompt.slug, exclude_id=prompt.id
+            )
+        prompt.is_active = active
 
     await session.flush()
-    await session.refresh(prompt)
     return prompt
 
 
-async def create_generation_task(
-    session: AsyncSession, data: GenerationTaskCreate
-) -> GenerationTask:
-    """Create a generation task tied to a user and prompt."""
-
-    payload = data.model_dump()
+def _generation_task_values(data: GenerationTaskCreate) -> dict[str, Any]:
+    payload = dict(data)
     status_value = payload.get("status")
     if isinstance(status_value, GenerationTaskStatus):
         payload["status"] = status_value
@@ -757,22 +1059,41 @@ async def create_generation_task(
         payload["status"] = GenerationTaskStatus.PENDING
     else:
         payload["status"] = GenerationTaskStatus.get_by_code(str(status_value))
-    payload["source"] = GenerationTaskSource(payload["source"])
-    payload["parameters"] = dict(payload.get("parameters") or {})
-    payload["result_parameters"] = dict(payload.get("result_parameters") or {})
+    payload["source"] = _enum_member(_GENERATION_TASK_SOURCES, payload["source"])
+    return payload
+
 
-    task = GenerationTask(**payload)
+async def create_generation_task(
+    session: AsyncSession, data: GenerationTaskCreate
+) -> GenerationTask:
+    """Create a generation task tied to a user and prompt."""
+
+    task = GenerationTask(**_generation_task_values(data))
     session.add(task)
     await session.flush()
-    await session.refresh(task)
     return task
 
 
+async def bulk_create_generation_tasks(
+    session: AsyncSession, items: Sequence[GenerationTaskCreate]
+) -> list[int]:
+    """Insert many generation tasks with one batched INSERT, returning their ids."""
+
+    if not items:
+        return []
+    result = await session.execute(
+        insert(GenerationTask).returning(
+            GenerationTask.id, sort_by_parameter_order=True
+        ),
+        [_generation_task_values(item) for item in items],
+    )
+    return list(result.scalars())
+
+
 async def get_generation_task_by_id(
     session: AsyncSession, task_id: int
 ) -> GenerationTask | None:
-    stmt = select(GenerationTask).where(GenerationTask.id == task_id)
-    result = await session.execute(stmt)
+    result = await session.execute(_GENERATION_TASK_BY_ID, {"task_id": task_id})
     return result.scalar_one_or_none()
 
 
@@ -791,14 +1112,10 @@ async def mark_generation_task_queued(
     """Mark a pending task as queued for processing."""
 
     _ensure_transition_allowed(task)
-    now = datetime.now(UTC)
-    if task.status != GenerationTaskStatus.QUEUED:
-        task.status = GenerationTaskStatus.QUEUED
+    values: dict[str, Any] = {"status": GenerationTaskStatus.QUEUED}
     if task.queued_at is None:
-        task.queued_at = now
-    await session.flush()
-    await session.refresh(task)
-    return task
+        values["queued_at"] = utcnow()
+    return await _update_returning(session, task, **values)
 
 
 async def mark_generation_task_started(
@@ -807,14 +1124,11 @@ async def mark_generation_task_started(
     """Mark a queued task as actively running."""
 
     _ensure_transition_allowed(task)
-    now = datetime.now(UTC)
-    task.status = GenerationTaskStatus.RUNNING
+    now = utcnow()
+    values: dict[str, Any] = {"status": GenerationTaskStatus.RUNNING, "started_at": now}
     if task.queued_at is None:
-        task.queued_at = now
-    task.started_at = now
-    await session.flush()
-    await session.refresh(task)
-    return task
+        values["queued_at"] = now
+    return await _update_returning(session, task, **values)
 
 
 async def mark_generation_task_succeeded(
@@ -832,19 +1146,18 @@ async def mark_generation_task_succeeded(
     }:
         raise ValueError("task must be running or queued to complete")
 
-    now = datetime.now(UTC)
     updates = data.model_dump(exclude_unset=True)
 
-    task.status = GenerationTaskStatus.SUCCEEDED
-    task.error = None
-    task.completed_at = now
-    task.result_asset_url = updates.get("result_asset_url", task.result_asset_url)
+    values: dict[str, Any] = {
+        "status": GenerationTaskStatus.SUCCEEDED,
+        "error": None,
+        "completed_at": utcnow(),
+    }
+    if "result_asset_url" in updates:
+        values["result_asset_url"] = updates["result_asset_url"]
     if "result_parameters" in updates:
-        task.result_parameters = dict(updates["result_parameters"] or {})
-
-    await session.flush()
-    await session.refresh(task)
-    return task
+        values["result_parameters"] = dict(updates["result_parameters"] or {})
+    return await _update_returning(session, task, **values)
 
 
 async def mark_generation_task_failed(
@@ -856,16 +1169,15 @@ async def mark_generation_task_failed(
 
     _ensure_transition_allowed(task)
 
-    now = datetime.now(UTC)
     updates = data.model_dump(exclude_unset=True)
 
-    task.status = GenerationTaskStatus.FAILED
-    task.error = updates["error"]
-    task.completed_at = now
-    task.result_asset_url = updates.get("result_asset_url", task.result_asset_url)
+    values: dict[str, Any] = {
+        "status": GenerationTaskStatus.FAILED,
+        "error": updates["error"],
+        "completed_at": utcnow(),
+    }
+    if "result_asset_url" in updates:
+        values["result_asset_url"] = updates["result_asset_url"]
     if "result_parameters" in updates:
-        task.result_parameters = dict(updates["result_parameters"] or {})
-
-    await session.flush()
-    await session.refresh(task)
-    return task
+        values["result_parameters"] = dict(updates["result_parameters"] or {})
+    return await _update_returning(session, task, **values)
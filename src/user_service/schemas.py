@@ -1,14 +1,18 @@
 from __future__ import annotations
 
 import re
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import UTC, datetime
 from decimal import ROUND_HALF_UP, Decimal
-from typing import Any
+from functools import lru_cache
+from typing import TYPE_CHECKING, Annotated, Any
 
-from jsonschema import Draft202012Validator
-from jsonschema import exceptions as jsonschema_exceptions
+import orjson
 from pydantic import (
     BaseModel,
+    BeforeValidator,
     ConfigDict,
     EmailStr,
     Field,
@@ -28,16 +32,51 @@ from .enums import (
     UserRole,
 )
 
+if TYPE_CHECKING:
+    from jsonschema import Draft202012Validator
+
+_CENT = Decimal("0.01")
+_ZERO = Decimal("0")
+
 
 def _quantize_two_places(value: Decimal) -> Decimal:
-    return value.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+    return value.quantize(_CENT, rounding=ROUND_HALF_UP)
+
 
+def _to_decimal(value: Any) -> Decimal:
+    # Decimals, ints and strings convert exactly; only floats (and anything
+    # else) go through str() so 19.99 stays 19.99 rather than its binary value.
+    if isinstance(value, Decimal):
+        return value
+    if type(value) is int or type(value) is str:
+        return Decimal(value)
+    return Decimal(str(value))
 
+
+def _coerce_generation_task_status(value: Any) -> Any:
+    """Resolve raw status strings through ``GenerationTaskStatus.get_by_code``.
+
+    Codes are trimmed and matched case-insensitively, so ``" PENDING "`` becomes
+    ``pending``, and legacy aliases such as ``"succeeded"`` map to their current
+    member. Enum members and non-string values go through normal validation.
+    """
+    if isinstance(value, str) and not isinstance(value, GenerationTaskStatus):
+        return GenerationTaskStatus.get_by_code(value)
+    return value
+
+
+GenerationTaskStatusCode = Annotated[
+    GenerationTaskStatus, BeforeValidator(_coerce_generation_task_status)
+]
+
+
+# Both helpers feed dict-typed fields, whose core validation already builds a
+# fresh dict, so the caller's mapping is never aliased and needs no copy here.
 def _coerce_mapping(value: Any) -> dict[str, Any]:
     if value is None:
         return {}
     if isinstance(value, dict):
-        return dict(value)
+        return value
     raise ValueError("value must be a mapping")
 
 
@@ -45,7 +84,7 @@ def _coerce_optional_mapping(value: Any) -> dict[str, Any | None] | None:
     if value is None:
         return None
     if isinstance(value, dict):
-        return dict(value)
+        return value
     raise ValueError("value must be a mapping")
 
 
@@ -61,7 +100,44 @@ def _validate_s3_uri(value: str | None) -> str | None:
     return value
 
 
+_NOW: ContextVar[datetime | None] = ContextVar("user_service_now", default=None)
+
+
+def utcnow() -> datetime:
+    """Return the pinned timestamp from :func:`fixed_now`, else the current time."""
+
+    return _NOW.get() or datetime.now(UTC)
+
+
+@contextmanager
+def fixed_now(value: datetime) -> Iterator[datetime]:
+    """Pin :func:`utcnow` to ``value`` so a batch of writes shares one timestamp."""
+
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    token = _NOW.set(value)
+    try:
+        yield value
+    finally:
+        _NOW.reset(token)
+
+
+def _as_utc(value: Any) -> datetime:
+    if isinstance(value, datetime):
+        candidate = value
+    elif isinstance(value, str):
+        candidate = datetime.fromisoformat(value)
+    else:
+        candidate = datetime.fromisoformat(str(value))
+    if candidate.tzinfo is None:
+        return candidate.replace(tzinfo=UTC)
+    if candidate.tzinfo is UTC:
+        return candidate
+    return candidate.astimezone(UTC)
+
+
 _SLUG_PATTERN = re.compile(r"^[a-z0-9]+(?:[-_][a-z0-9]+)*$")
+_SLUG_FULLMATCH = _SLUG_PATTERN.fullmatch
 
 
 def _normalise_slug(value: str) -> str:
@@ -70,32 +146,65 @@ def _normalise_slug(value: str) -> str:
     slug = value.strip().lower()
     if not slug:
         raise ValueError("slug must not be empty")
-    if not _SLUG_PATTERN.fullmatch(slug):
+    if not _SLUG_FULLMATCH(slug):
         raise ValueError(
             "slug may contain lowercase letters, numbers, hyphens, or underscores only"
         )
     return slug
 
 
-def _ensure_json_schema(value: Any) -> dict[str, Any]:
-    schema = _coerce_mapping(value)
+def _build_validator(schema: dict[str, Any]) -> Draft202012Validator:
+    # jsonschema is a heavy import that only prompt validation needs, so it is
+    # deferred to the first validator build.
+    from jsonschema import Draft202012Validator, SchemaError
+
     try:
         Draft202012Validator.check_schema(schema)
-    except jsonschema_exceptions.SchemaError as exc:  # pragma: no cover - defensive
+    except SchemaError as exc:
         raise ValueError(
             f"parameters_schema is not a valid JSON Schema: {exc.message}"
         ) from exc
+    return Draft202012Validator(schema)
+
+
+@lru_cache(maxsize=256)
+def _compiled_validator(schema_json: bytes) -> Draft202012Validator:
+    return _build_validator(orjson.loads(schema_json))
+
+
+def schema_validator(schema: dict[str, Any]) -> Draft202012Validator:
+    """Return a checked validator for ``schema``, shared by identical schemas.
+
+    Schemas orjson cannot encode as a cache key (``Decimal`` bounds, non-string
+    keys) get an uncached validator. Raises ``ValueError`` for an invalid
+    schema.
+    """
+
+    try:
+        schema_json = orjson.dumps(schema, option=orjson.OPT_SORT_KEYS)
+    except orjson.JSONEncodeError:
+        return _build_validator(schema)
+    return _compiled_validator(schema_json)
+
+
+def _ensure_json_schema(value: Any) -> dict[str, Any]:
+    schema = _coerce_mapping(value)
+    schema_validator(schema)
     return schema
 
 
-def _validate_against_schema(
+def validate_prompt_parameters(
     parameters: dict[str, Any], schema: dict[str, Any]
-) -> dict[str, Any]:
-    validator = Draft202012Validator(schema)
-    error = next(validator.iter_errors(parameters), None)
+) -> None:
+    """Raise ``ValueError`` unless ``parameters`` conform to ``schema``.
+
+    Only the compiled validator is cached; the parameters themselves are
+    validated as given on every call.
+    """
+
+    error = next(schema_validator(schema).iter_errors(parameters), None)
     if error is not None:
         raise ValueError(f"parameters do not conform to schema: {error.message}")
-    return parameters
 
 
 class UserCreate(BaseModel):
@@ -111,8 +220,8 @@ class UserCreate(BaseModel):
     @field_validator("balance", mode="before")
     @classmethod
     def validate_balance(cls, value: Decimal | str | int | float) -> Decimal:
-        decimal_value = Decimal(str(value))
-        if decimal_value < Decimal("0"):
+        decimal_value = _to_decimal(value)
+        if decimal_value < _ZERO:
             raise ValueError("balance cannot be negative")
         return _quantize_two_places(decimal_value)
 
@@ -135,7 +244,7 @@ class UserUpdate(BaseModel):
     ) -> Decimal | None:
         if value is None:
             return None
-        return _quantize_two_places(Decimal(str(value)))
+        return _quantize_two_places(_to_decimal(value))
 
 
 class UserRead(BaseModel):
@@ -189,11 +298,8 @@ class UserSessionCreate(BaseModel):
     @field_validator("expires_at")
     @classmethod
     def ensure_future(cls, value: datetime) -> datetime:
-        candidate = value
-        if candidate.tzinfo is None:
-            candidate = candidate.replace(tzinfo=UTC)
-        candidate_utc = candidate.astimezone(UTC)
-        if candidate_utc <= datetime.now(UTC):
+        candidate_utc = _as_utc(value)
+        if candidate_utc <= utcnow():
             raise ValueError("expires_at must be in the future")
         return candidate_utc
 
@@ -237,13 +343,7 @@ class SubscriptionCreate(BaseModel):
     @field_validator("current_period_start", "current_period_end", mode="before")
     @classmethod
     def ensure_timezone(cls, value: datetime) -> datetime:
-        if isinstance(value, datetime):
-            candidate = value
-        else:
-            candidate = datetime.fromisoformat(str(value))
-        if candidate.tzinfo is None:
-            candidate = candidate.replace(tzinfo=UTC)
-        return candidate.astimezone(UTC)
+        return _as_utc(value)
 
     @model_validator(mode="after")
     def validate_period(self) -> SubscriptionCreate:
@@ -266,13 +366,7 @@ class SubscriptionRenew(BaseModel):
     @field_validator("new_period_end", mode="before")
     @classmethod
     def ensure_timezone(cls, value: datetime) -> datetime:
-        if isinstance(value, datetime):
-            candidate = value
-        else:
-            candidate = datetime.fromisoformat(str(value))
-        if candidate.tzinfo is None:
-            candidate = candidate.replace(tzinfo=UTC)
-        return candidate.astimezone(UTC)
+        return _as_utc(value)
 
 
 class PaymentCreate(BaseModel):
@@ -284,15 +378,15 @@ class PaymentCreate(BaseModel):
     provider_payment_id: str | None = Field(None, max_length=120)
     provider_data: dict[str, Any] = Field(default_factory=dict)
     metadata: dict[str, Any] = Field(default_factory=dict)
-    paid_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
+    paid_at: datetime = Field(default_factory=utcnow)
 
     model_config = ConfigDict(use_enum_values=True)
 
     @field_validator("amount", mode="before")
     @classmethod
     def validate_amount(cls, value: Decimal | str | int | float) -> Decimal:
-        decimal_value = Decimal(str(value))
-        if decimal_value < Decimal("0"):
+        decimal_value = _to_decimal(value)
+        if decimal_value < _ZERO:
             raise ValueError("amount cannot be negative")
         return _quantize_two_places(decimal_value)
 
@@ -304,15 +398,7 @@ class PaymentCreate(BaseModel):
     @field_validator("paid_at", mode="before")
     @classmethod
     def ensure_timezone(cls, value: datetime) -> datetime:
-        if value is None:
-            candidate = datetime.now(UTC)
-        elif isinstance(value, datetime):
-            candidate = value
-        else:
-            candidate = datetime.fromisoformat(str(value))
-        if candidate.tzinfo is None:
-            candidate = candidate.replace(tzinfo=UTC)
-        return candidate.astimezone(UTC)
+        return _as_utc(utcnow() if value is None else value)
 
 
 class TransactionCreate(BaseModel):
@@ -330,7 +416,7 @@ class TransactionCreate(BaseModel):
     @field_validator("amount", mode="before")
     @classmethod
     def validate_amount(cls, value: Decimal | str | int | float) -> Decimal:
-        return _quantize_two_places(Decimal(str(value)))
+        return _quantize_two_places(_to_decimal(value))
 
     @field_validator("currency")
     @classmethod
@@ -361,7 +447,9 @@ class PromptCreate(BaseModel):
     @field_validator("parameters_schema", mode="before")
     @classmethod
     def validate_parameters_schema(cls, value: Any) -> dict[str, Any]:
-        return _ensure_json_schema(value)
+        # The schema itself is checked by ensure_parameters_fit_schema, whose
+        # cached validation covers the meta-schema check as well.
+        return _coerce_mapping(value)
 
     @field_validator("parameters", mode="before")
     @classmethod
@@ -375,7 +463,7 @@ class PromptCreate(BaseModel):
 
     @model_validator(mode="after")
     def ensure_parameters_fit_schema(self) -> PromptCreate:
-        _validate_against_schema(self.parameters, self.parameters_schema)
+        validate_prompt_parameters(self.parameters, self.parameters_schema)
         return self
 
 
@@ -432,6 +520,12 @@ class GenerationTaskCreate(BaseModel):
 
     model_config = ConfigDict(use_enum_values=True)
 
+    @field_validator("status", mode="before")
+    @classmethod
+    def validate_status(cls, value: Any) -> Any:
+        """Accept any status code understood by ``GenerationTaskStatusCode``."""
+        return _coerce_generation_task_status(value)
+
     @field_validator("parameters", mode="before")
     @classmethod
     def validate_parameters(cls, value: Any) -> dict[str, Any]:
@@ -4,6 +4,7 @@ from datetime import UTC, datetime
 from decimal import Decimal
 
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
 
 from . import repository
 from .enums import SubscriptionStatus
@@ -17,6 +18,7 @@ from .schemas import (
     UserProfileCreate,
     UserSessionCreate,
     UserUpdate,
+    utcnow,
 )
 
 
@@ -36,8 +38,10 @@ async def register_user(
     user = await repository.create_user(session, user_data)
     if profile_data is not None:
         enriched = profile_data.model_copy(update={"user_id": user.id})
-        await repository.create_profile(session, enriched)
-        await session.refresh(user, ["profile"])
+        profile = await repository.create_profile(session, enriched)
+        # Both ends are known in memory; link them without reloading either row.
+        set_committed_value(user, "profile", profile)
+        set_committed_value(profile, "user", user)
     return user
 
 
@@ -50,9 +54,7 @@ async def update_user_details(
 async def adjust_balance_by(
     session: AsyncSession, user: User, delta: Decimal
 ) -> Decimal:
-    new_balance = await repository.adjust_user_balance(session, user.id, delta)
-    await session.refresh(user)
-    return new_balance
+    return await repository.adjust_user_balance(session, user.id, delta)
 
 
 async def soft_delete_account(session: AsyncSession, user: User) -> User:
@@ -91,7 +93,6 @@ async def activate_subscription(
     await repository.create_subscription_history_snapshot(
         session, subscription, reason=reason or "activated"
     )
-    await session.refresh(subscription)
     return subscription
 
 
@@ -122,8 +123,8 @@ async def renew_subscription(
             **data.provider_data,
         }
     if data.metadata:
-        subscription.metadata_dict = {
-            **subscription.metadata_dict,
+        subscription.meta_data = {
+            **subscription.meta_data,
             **data.metadata,
         }
 
@@ -131,7 +132,6 @@ async def renew_subscription(
     await repository.create_subscription_history_snapshot(
         session, subscription, reason=data.reason or "renewed"
     )
-    await session.refresh(subscription)
     return subscription
 
 
@@ -144,7 +144,7 @@ async def cancel_subscription(
 ) -> Subscription:
     """Mark a subscription as canceled while preserving historical context."""
 
-    effective_source = effective_at or datetime.now(UTC)
+    effective_source = effective_at or utcnow()
     effective = _ensure_utc_aware(effective_source)
 
     if subscription.status == SubscriptionStatus.CANCELED and subscription.canceled_at:
@@ -162,7 +162,6 @@ async def cancel_subscription(
     await repository.create_subscription_history_snapshot(
         session, subscription, reason=reason or "canceled"
     )
-    await session.refresh(subscription)
     return subscription
 
 
@@ -174,7 +173,6 @@ async def increment_subscription_usage_by(
     updated = await repository.increment_subscription_usage(
         session, subscription, amount
     )
-    await session.refresh(subscription)
     return updated
 
 
@@ -209,5 +207,4 @@ async def record_subscription_transaction(
     await repository.create_subscription_history_snapshot(
         session, subscription, reason=reason or "transaction-recorded"
     )
-    await session.refresh(subscription)
     return transaction
@@ -1,15 +1,26 @@
 #!/usr/bin/env python3
 """Test script to verify metadata changes work correctly."""
+import sys
+from pathlib import Path
+
+# Import through the same package roots as the application so the mixin is
+# loaded once as ``common.sqlalchemy`` rather than again under ``src.common``.
+sys.path.insert(0, str(Path(__file__).resolve().parent / "src"))
+
 from sqlalchemy import MetaData
 
 # Test 1: Verify the mixin itself
-from src.common.sqlalchemy.metadata_mixin import MetadataAliasMixin
+from common.sqlalchemy import MetadataAliasMixin
 print("✓ MetadataAliasMixin imported successfully")
 
 # Test 2: Verify user_service models
-from src.user_service.models import Base, Payment, Subscription
+from user_service.models import Base, Payment, Subscription
 print("✓ User service models imported successfully")
 
+assert issubclass(Payment, MetadataAliasMixin)
+assert "src.common.sqlalchemy.metadata_mixin" not in sys.modules
+print("✓ Models share the single canonical MetadataAliasMixin")
+
 # Test 3: Verify class-level metadata is MetaData
 assert isinstance(Base.metadata, MetaData)
 print("✓ Base.metadata is MetaData")
@@ -33,17 +44,13 @@ payment = Payment(
 )
 print("✓ Payment instance created with metadata argument")
 
-# Test 5: Verify metadata_dict property works
-assert payment.metadata_dict == {"test": "data"}
-print("✓ payment.metadata_dict returns correct dict")
-
-# Test 6: Verify metadata_dict setter works
-payment.metadata_dict = {"updated": "value"}
-assert payment.metadata_dict == {"updated": "value"}
-print("✓ payment.metadata_dict setter works")
+# Test 5: Verify the metadata argument lands in the meta_data column
+assert payment.meta_data == {"test": "data"}
+print("✓ payment.meta_data returns correct dict")
 
-# Test 7: Verify meta_data column is updated
+# Test 6: Verify meta_data assignment works
+payment.meta_data = {"updated": "value"}
 assert payment.meta_data == {"updated": "value"}
-print("✓ payment.meta_data column is correct")
+print("✓ payment.meta_data assignment works")
 
 print("\n✓ All metadata tests passed!")
@@ -17,5 +17,4 @@ async def test_setup_bot_commands_sets_expected_list() -> None:
     await setup_bot_commands(bot)
     bot.set_my_commands.assert_awaited_once()
     (commands,), _ = bot.set_my_commands.await_args
-    assert len(commands) == len(BOT_COMMANDS)
-    assert all(command in commands for command in BOT_COMMANDS)
+    assert list(commands) == list(BOT_COMMANDS)
@@ -3,7 +3,12 @@ from __future__ import annotations
 import pytest
 
 from bot.exceptions import InvalidFileError
-from bot.validators import human_readable_size, validate_image
+from bot.validators import (
+    ImageFile,
+    human_readable_size,
+    validate_image,
+    validate_images,
+)
 
 
 @pytest.mark.parametrize(
@@ -45,3 +50,51 @@ async def test_validate_image_rejects_missing_size() -> None:
     with pytest.raises(InvalidFileError) as exc:
         validate_image(file_name="image.png", file_size=None, mime_type="image/png")
     assert "Unable to determine" in str(exc.value)
+
+
+def test_validate_image_rejects_unknown_extension_without_mime() -> None:
+    with pytest.raises(InvalidFileError) as exc:
+        validate_image(file_name="image.GIF", file_size=1024, mime_type=None)
+    assert "'.gif'" in str(exc.value)
+    assert ".jpeg, .jpg, .png" in str(exc.value)
+
+
+def test_validate_image_extension_is_case_insensitive() -> None:
+    validate_image(file_name="photo.final.JPG", file_size=1024, mime_type=None)
+
+
+@pytest.mark.parametrize(
+    "size,expected",
+    [
+        (0, "0 B"),
+        (1023, "1023 B"),
+        (1024, "1.0 KB"),
+        (1024 * 1024 - 1, "1024.0 KB"),
+        (1024 * 1024, "1.0 MB"),
+        (3 * 1024 * 1024 * 1024, "3072.0 MB"),
+    ],
+)
+def test_human_readable_size_unit_boundaries(size: int, expected: str) -> None:
+    assert human_readable_size(size) == expected
+
+
+def test_validate_images_accepts_album() -> None:
+    validate_images(
+        [
+            ImageFile("one.jpg", 1024, "image/jpeg"),
+            ImageFile(None, 2048, None),
+            ImageFile("two.PNG", 4096, "image/png"),
+        ]
+    )
+
+
+def test_validate_images_reports_first_invalid_file() -> None:
+    with pytest.raises(InvalidFileError) as exc:
+        validate_images(
+            [
+                ImageFile("one.jpg", 1024, "image/jpeg"),
+                ImageFile("two.bmp", 1024, None),
+                ImageFile("three.png", None, "image/png"),
+            ]
+        )
+    assert "Unsupported extension '.bmp'" in str(exc.value)
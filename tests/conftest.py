@@ -1,15 +1,20 @@
 from __future__ import annotations
 
-from collections.abc import AsyncIterator
+import shutil
+from collections.abc import AsyncIterator, Callable, Iterator
+from contextlib import AbstractContextManager, contextmanager
 from pathlib import Path
 
+import pytest
 import pytest_asyncio
 from alembic.config import Config
-from sqlalchemy import text
+from sqlalchemy import event, text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 
+StatementCapture = Callable[[AsyncSession], AbstractContextManager[list[str]]]
+
 
 def make_alembic_config(database_url: str) -> Config:
     config = Config(str(PROJECT_ROOT / "alembic.ini"))
@@ -18,22 +23,30 @@ def make_alembic_config(database_url: str) -> Config:
     return config
 
 
+@pytest_asyncio.fixture(scope="session")
+async def database_template(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Create the schema once; each test starts from a copy of this file."""
+
+    from user_service.models import Base
+
+    template_path = tmp_path_factory.mktemp("database") / "template.db"
+    engine = create_async_engine(f"sqlite+aiosqlite:///{template_path}", future=True)
+    try:
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+    finally:
+        await engine.dispose()
+    return template_path
+
+
 @pytest_asyncio.fixture
 async def session_factory(
-    tmp_path: Path,
+    tmp_path: Path, database_template: Path
 ) -> AsyncIterator[async_sessionmaker[AsyncSession]]:
     db_path = tmp_path / "test.db"
-    async_url = f"sqlite+aiosqlite:///{db_path}"
+    shutil.copyfile(database_template, db_path)
 
-    from user_service.models import Base
-
-    engine = create_async_engine(async_url, future=True)
-    async with engine.begin() as connection:
-        await connection.execute(text("PRAGMA foreign_keys=ON"))
-        await connection.run_sync(Base.metadata.create_all)
-    await engine.dispose()
-
-    engine = create_async_engine(async_url, future=True)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}", future=True)
 
     async with engine.begin() as connection:
         await connection.execute(text("PRAGMA foreign_keys=ON"))
@@ -44,3 +57,25 @@ async def session_factory(
         yield session_maker
     finally:
         await engine.dispose()
+
+
+@contextmanager
+def _capture_statements(session: AsyncSession) -> Iterator[list[str]]:
+    statements: list[str] = []
+
+    def _record(*args: object) -> None:
+        statements.append(str(args[2]))
+
+    sync_engine = session.bind.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", _record)
+    try:
+        yield statements
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", _record)
+
+
+@pytest.fixture
+def capture_statements() -> StatementCapture:
+    """Record the SQL sent to the database while the context is open."""
+
+    return _capture_statements
@@ -1,11 +1,17 @@
 from __future__ import annotations
 
+import importlib.util
+from datetime import UTC, datetime
 from decimal import Decimal
+from pathlib import Path
 
 import pytest
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy import select, text
+from sqlalchemy.exc import IntegrityError, InvalidRequestError
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import undefer_group
 
+from tests.conftest import StatementCapture
 from tests.factories import (
     payment_create_factory,
     subscription_create_factory,
@@ -15,7 +21,26 @@ from tests.factories import (
 )
 from user_service import repository, services
 from user_service.enums import SubscriptionStatus, TransactionType
-from user_service.models import Subscription
+from user_service.models import (
+    PROVIDER_PAYLOAD_GROUP,
+    Payment,
+    Subscription,
+)
+from user_service.schemas import PaymentCreate, fixed_now
+
+
+def _snapshot_query() -> str:
+    # The view's query lives in its migration; load it from there so the test
+    # cannot drift from what is deployed.
+    path = (
+        Path(__file__).resolve().parent.parent
+        / "migrations/versions/0013_create_user_balance_snapshot.py"
+    )
+    spec = importlib.util.spec_from_file_location("snapshot_migration", path)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.SNAPSHOT_QUERY
 
 
 @pytest.mark.asyncio
@@ -97,6 +122,20 @@ async def test_cancel_subscription_sets_flags_and_history(
         assert len(second.history) == 2
 
 
+def test_fixed_now_pins_payment_timestamps() -> None:
+    pinned = datetime(2026, 3, 1, 12, 0)
+
+    with fixed_now(pinned):
+        defaulted = PaymentCreate(user_id=1, amount=Decimal("1"), currency="usd")
+        explicit_none = PaymentCreate(
+            user_id=1, amount=Decimal("1"), currency="usd", paid_at=None
+        )
+
+    assert defaulted.paid_at == explicit_none.paid_at == pinned.replace(tzinfo=UTC)
+    unpinned = PaymentCreate(user_id=1, amount=Decimal("1"), currency="usd")
+    assert unpinned.paid_at > pinned.replace(tzinfo=UTC)
+
+
 @pytest.mark.asyncio
 async def test_record_transaction_creates_payment_and_history(
     session_factory: async_sessionmaker[AsyncSession],
@@ -167,3 +206,168 @@ async def test_usage_increment_and_constraint(
         refreshed = await repository.get_subscription_by_id(session, subscription_id)
         assert isinstance(refreshed, Subscription)
         assert refreshed.quota_used == 10
+
+
+@pytest.mark.asyncio
+async def test_bulk_history_and_transactions_use_single_inserts(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    async with session_factory() as session:
+        subscriptions = []
+        for _ in range(3):
+            user = await repository.create_user(session, user_create_factory())
+            subscriptions.append(
+                await repository.create_subscription(
+                    session, subscription_create_factory(user.id)
+                )
+            )
+
+        history_ids = await repository.bulk_create_subscription_history_snapshots(
+            session, subscriptions, reason="billing-run"
+        )
+        assert len(history_ids) == 3
+
+        first = subscriptions[0]
+        await session.refresh(first, attribute_names=["history"])
+        assert [entry.id for entry in first.history] == history_ids[:1]
+        assert first.history[0].reason == "billing-run"
+        assert first.history[0].meta_data == first.meta_data
+
+        payment_ids = await repository.bulk_create_payments(
+            session,
+            [payment_create_factory(sub.user_id, sub.id) for sub in subscriptions],
+        )
+        assert len(payment_ids) == 3
+        payment = await session.get(Payment, payment_ids[0])
+        assert payment is not None
+        assert payment.meta_data == {"note": "test"}
+
+        transaction_ids = await repository.bulk_create_transactions(
+            session,
+            payment_id=payment.id,
+            items=[
+                transaction_create_factory(first.user_id, first.id),
+                transaction_create_factory(
+                    first.user_id, first.id, txn_type=TransactionType.REFUND
+                ),
+            ],
+        )
+        assert len(transaction_ids) == 2
+
+        await session.refresh(payment, attribute_names=["transactions"])
+        assert sorted(txn.id for txn in payment.transactions) == sorted(transaction_ids)
+        assert {txn.type for txn in payment.transactions} == {
+            TransactionType.CHARGE,
+            TransactionType.REFUND,
+        }
+        assert payment.transactions[0].meta_data == {"note": "test-transaction"}
+
+        assert (
+            await repository.bulk_create_subscription_history_snapshots(session, [])
+            == []
+        )
+
+
+@pytest.mark.asyncio
+async def test_batch_transactions_flushes_queued_rows_together(
+    session_factory: async_sessionmaker[AsyncSession],
+    capture_statements: StatementCapture,
+) -> None:
+    async with session_factory() as session:
+        user = await repository.create_user(session, user_create_factory())
+        payment = await repository.create_payment(
+            session, payment_create_factory(user.id, None)
+        )
+
+        with capture_statements(session) as statements:
+            async with repository.batch_transactions(session):
+                transactions = [
+                    await repository.create_transaction(
+                        session,
+                        payment_id=payment.id,
+                        data=transaction_create_factory(user.id, None),
+                    )
+                    for _ in range(3)
+                ]
+                assert statements == []
+                assert all(txn.id is None for txn in transactions)
+
+        # One flush on exit; SQLite still sends a row per INSERT because it
+        # cannot order RETURNING rows, PostgreSQL batches them.
+        assert len(statements) == 3
+        assert all(sql.startswith("INSERT INTO transactions") for sql in statements)
+        assert all(txn.id is not None for txn in transactions)
+        assert "transaction_batch" not in session.info
+
+
+@pytest.mark.asyncio
+async def test_user_balance_snapshot_aggregates_ledger(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    async with session_factory() as session:
+        await session.execute(
+            text(f"CREATE VIEW user_balance_snapshot AS {_snapshot_query()}")
+        )
+        user = await repository.create_user(session, user_create_factory())
+        subscription = await services.activate_subscription(
+            session, subscription_create_factory(user.id)
+        )
+        payment = await repository.create_payment(
+            session, payment_create_factory(user.id, subscription.id)
+        )
+        await repository.bulk_create_transactions(
+            session,
+            payment_id=payment.id,
+            items=[
+                transaction_create_factory(
+                    user.id, subscription.id, amount=Decimal("30.00")
+                ),
+                transaction_create_factory(
+                    user.id, subscription.id, amount=Decimal("12.50")
+                ),
+                transaction_create_factory(
+                    user.id,
+                    subscription.id,
+                    amount=Decimal("5.00"),
+                    txn_type=TransactionType.REFUND,
+                ),
+            ],
+        )
+        await repository.refresh_user_balance_snapshot(session)
+
+        snapshot = await repository.get_user_balance_snapshot(session, user.id)
+        assert snapshot is not None
+        assert snapshot.total_charged == Decimal("42.50")
+        assert snapshot.total_refunded == Decimal("5.00")
+        assert snapshot.total_credited == Decimal("0.00")
+        assert snapshot.transaction_count == 3
+
+        assert await repository.get_user_balance_snapshot(session, user.id + 1) is None
+
+
+@pytest.mark.asyncio
+async def test_payment_provider_data_is_deferred(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    async with session_factory() as session:
+        user = await repository.create_user(session, user_create_factory())
+        payment = await repository.create_payment(
+            session,
+            payment_create_factory(user.id, None, provider_data={"charge": "ch_1"}),
+        )
+        assert payment.provider_data == {"charge": "ch_1"}
+        await session.commit()
+
+    async with session_factory() as session:
+        listed = (await session.scalars(select(Payment))).one()
+        with pytest.raises(InvalidRequestError):
+            listed.provider_data  # noqa: B018
+
+        detailed = (
+            await session.scalars(
+                select(Payment)
+                .options(undefer_group(PROVIDER_PAYLOAD_GROUP))
+                .execution_options(populate_existing=True)
+            )
+        ).one()
+        assert detailed.provider_data == {"charge": "ch_1"}
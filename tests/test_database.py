@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import UTC, datetime
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy import JSON, event, literal, select, text
+
+from user_service.database import (
+    INSERTMANYVALUES_PAGE_SIZE,
+    _engine_template,
+    create_engine,
+    session_scope,
+)
+from user_service.models import Base, User
+
+
+def _session_factory() -> tuple[MagicMock, AsyncMock]:
+    session = AsyncMock()
+    session.__aenter__.return_value = session
+    return MagicMock(return_value=session), session
+
+
+@pytest.mark.asyncio
+async def test_sqlite_engine_applies_pragmas_on_connect(tmp_path: Path) -> None:
+    engine = create_engine(f"sqlite+aiosqlite:///{tmp_path / 'pragmas.db'}")
+    try:
+        async with engine.connect() as connection:
+            journal_mode = await connection.scalar(text("PRAGMA journal_mode"))
+            busy_timeout = await connection.scalar(text("PRAGMA busy_timeout"))
+            synchronous = await connection.scalar(text("PRAGMA synchronous"))
+    finally:
+        await engine.dispose()
+
+    assert journal_mode == "wal"
+    assert busy_timeout == 30000
+    assert synchronous == 1  # NORMAL
+
+
+@pytest.mark.asyncio
+async def test_engine_serializes_json_with_orjson(tmp_path: Path) -> None:
+    engine = create_engine(f"sqlite+aiosqlite:///{tmp_path / 'json.db'}")
+    document = {1: "one", "at": datetime(2026, 1, 1, tzinfo=UTC)}
+    try:
+        async with engine.connect() as connection:
+            stored = await connection.scalar(select(literal(document, JSON)))
+    finally:
+        await engine.dispose()
+
+    # The stdlib encoder would reject the datetime outright.
+    assert stored == {"1": "one", "at": "2026-01-01T00:00:00+00:00"}
+
+
+@pytest.mark.asyncio
+async def test_engine_reuses_compiled_statements(tmp_path: Path) -> None:
+    engine = create_engine(f"sqlite+aiosqlite:///{tmp_path / 'cache.db'}")
+    cache_hits: list[bool] = []
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _record(
+        conn: Any,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: Any,
+        executemany: bool,
+    ) -> None:
+        if statement.startswith("SELECT users"):
+            cache_hits.append(context.cache_hit == context.dialect.CACHE_HIT)
+
+    try:
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+            for email in ("a@example.com", "b@example.com", "c@example.com"):
+                await connection.execute(select(User).where(User.email == email))
+    finally:
+        await engine.dispose()
+
+    assert engine.dialect.insertmanyvalues_page_size == INSERTMANYVALUES_PAGE_SIZE
+    assert cache_hits == [False, True, True]
+
+
+def test_engine_template_is_cached_per_url() -> None:
+    _engine_template.cache_clear()
+    url = "sqlite+aiosqlite:///./cached.db"
+
+    first = _engine_template(url)
+    second = _engine_template(url)
+
+    assert second is first
+    assert _engine_template.cache_info().hits == 1
+
+    is_sqlite, is_memory, connect_args = first
+    assert is_sqlite is True
+    assert is_memory is False
+    assert isinstance(connect_args, MappingProxyType)
+    assert connect_args == {"timeout": 30, "check_same_thread": False}
+
+    assert _engine_template("sqlite+aiosqlite:///:memory:")[1] is True
+    assert _engine_template("postgresql+asyncpg://db/app") == (False, False, {})
+
+
+@pytest.mark.asyncio
+async def test_session_scope_commits_on_success() -> None:
+    factory, session = _session_factory()
+
+    async with session_scope(factory) as scoped:
+        assert scoped is session
+
+    session.commit.assert_awaited_once()
+    session.rollback.assert_not_awaited()
+    session.__aexit__.assert_awaited_once_with(None, None, None)
+
+
+@pytest.mark.asyncio
+async def test_session_scope_rolls_back_on_exception() -> None:
+    factory, session = _session_factory()
+
+    with pytest.raises(RuntimeError, match="boom"):
+        async with session_scope(factory):
+            raise RuntimeError("boom")
+
+    session.commit.assert_not_awaited()
+    session.rollback.assert_awaited_once()
+    session.__aexit__.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_session_scope_rolls_back_when_commit_fails() -> None:
+    factory, session = _session_factory()
+    session.commit.side_effect = RuntimeError("commit failed")
+
+    with pytest.raises(RuntimeError, match="commit failed"):
+        async with session_scope(factory):
+            pass
+
+    session.rollback.assert_awaited_once()
+    session.__aexit__.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_session_scope_closes_without_rollback_on_base_exception() -> None:
+    factory, session = _session_factory()
+
+    with pytest.raises(asyncio.CancelledError):
+        async with session_scope(factory):
+            raise asyncio.CancelledError
+
+    session.commit.assert_not_awaited()
+    session.rollback.assert_not_awaited()
+    session.__aexit__.assert_awaited_once()
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from datetime import UTC, datetime, timedelta
+
 import pytest
 from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
@@ -10,8 +12,10 @@ from user_service.schemas import (
     GenerationTaskCreate,
     GenerationTaskResultUpdate,
     PromptCreate,
+    fixed_now,
 )
 
+from .conftest import StatementCapture
 from .factories import (
     generation_task_create_factory,
     generation_task_failure_update_factory,
@@ -104,6 +108,43 @@ async def test_generation_task_lifecycle_transitions(
         assert fetched.result_asset_url == result_update.result_asset_url
 
 
+@pytest.mark.asyncio
+async def test_generation_task_transition_stamps_time_in_one_statement(
+    session_factory: async_sessionmaker[AsyncSession],
+    capture_statements: StatementCapture,
+) -> None:
+    async with session_factory() as session:
+        user = await repository.create_user(session, user_create_factory())
+        prompt = await repository.create_prompt(session, prompt_create_factory())
+        task = await repository.create_generation_task(
+            session,
+            generation_task_create_factory(user_id=user.id, prompt_id=prompt.id),
+        )
+
+        started_at = datetime(2026, 1, 1, 12, 0, 0, 250000, tzinfo=UTC)
+        with fixed_now(started_at), capture_statements(session) as statements:
+            started = await repository.mark_generation_task_started(session, task)
+
+        assert started is task
+        # SQLite hands DateTime(timezone=True) values back naive.
+        assert started.started_at.replace(tzinfo=UTC) == started_at
+        assert started.queued_at == started.started_at
+
+        # Stamps come from the application clock, so transitions inside one
+        # transaction keep their order and sub-second precision.
+        completed_at = started_at + timedelta(milliseconds=1)
+        with fixed_now(completed_at):
+            completed = await repository.mark_generation_task_succeeded(
+                session, started, generation_task_result_update_factory()
+            )
+        assert completed.completed_at.replace(tzinfo=UTC) == completed_at
+        assert completed.completed_at > completed.started_at
+
+    assert len(statements) == 1
+    assert statements[0].startswith("UPDATE generation_tasks")
+    assert "RETURNING" in statements[0]
+
+
 @pytest.mark.asyncio
 async def test_generation_task_failure_records_error(
     session_factory: async_sessionmaker[AsyncSession],
@@ -184,7 +225,19 @@ def test_generation_task_status_legacy_aliases() -> None:
         GenerationTaskStatus.get_by_code("Succeeded") == GenerationTaskStatus.COMPLETED
     )
 
-    assert GenerationTaskStatus("succeeded") == GenerationTaskStatus.COMPLETED
+    with pytest.raises(ValueError):
+        GenerationTaskStatus("succeeded")
+
+
+def test_generation_task_create_accepts_legacy_status() -> None:
+    payload = GenerationTaskCreate(user_id=1, prompt_id=1, status="succeeded")
+    assert payload.status == GenerationTaskStatus.COMPLETED
+
+    payload = GenerationTaskCreate(user_id=1, prompt_id=1, status="  PENDING ")
+    assert payload.status == GenerationTaskStatus.PENDING
+
+    with pytest.raises(ValidationError, match="invalid status code"):
+        GenerationTaskCreate(user_id=1, prompt_id=1, status="bogus")
 
 
 def test_generation_task_status_get_by_code_invalid() -> None:
@@ -224,3 +277,28 @@ def test_generation_task_status_succeeded_alias() -> None:
     assert alias is GenerationTaskStatus.COMPLETED
     assert alias.value == "completed"
     assert GenerationTaskStatus.COMPLETED.value == "completed"
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_generation_tasks(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    async with session_factory() as session:
+        user = await repository.create_user(session, user_create_factory())
+        prompt = await repository.create_prompt(session, prompt_create_factory())
+
+        task_ids = await repository.bulk_create_generation_tasks(
+            session,
+            [
+                generation_task_create_factory(user.id, prompt.id),
+                generation_task_create_factory(
+                    user.id, prompt.id, status=GenerationTaskStatus.QUEUED
+                ),
+            ],
+        )
+        assert len(task_ids) == 2
+
+        queued = await repository.get_generation_task_by_id(session, task_ids[1])
+        assert queued is not None
+        assert queued.status is GenerationTaskStatus.QUEUED
+        assert queued.parameters == {"size": "1024x1024"}
@@ -1,5 +1,9 @@
 from __future__ import annotations
 
+import inspect
+from types import MappingProxyType
+
+import pytest
 from sqlalchemy import MetaData
 
 from user_service.models import (
@@ -26,11 +30,10 @@ def test_user_service_payment_metadata_descriptor() -> None:
         metadata=payload,
     )
 
-    assert payment.metadata_dict == payload
     assert payment.meta_data == payload
 
     new_payload = {"updated": "data"}
-    payment.metadata_dict = new_payload
+    payment.meta_data = new_payload
 
     assert payment.meta_data == new_payload
 
@@ -53,7 +56,6 @@ def test_user_service_subscription_metadata_descriptor() -> None:
         metadata=payload,
     )
 
-    assert subscription.metadata_dict == payload
     assert subscription.meta_data == payload
 
 
@@ -69,3 +71,27 @@ def test_user_service_transaction_metadata_descriptor() -> None:
 
     assert isinstance(class_metadata, MetaData)
     assert class_metadata is Base.metadata
+
+
+def test_class_metadata_is_a_plain_class_attribute() -> None:
+    # ``metadata`` must stay a MetaData stored on the declarative base rather
+    # than a descriptor, so class and instance access are plain dict lookups.
+    assert "metadata" in Base.__dict__
+    for model in (Payment, Subscription, SubscriptionHistory, Transaction):
+        assert inspect.getattr_static(model, "metadata") is Base.metadata
+
+    payment = Payment(user_id=1, amount=1, currency="USD")
+    assert payment.metadata is Base.metadata
+
+
+def test_metadata_kwarg_coerces_read_only_mappings() -> None:
+    payload = MappingProxyType({"source": "import"})
+    transaction = Transaction(user_id=1, payment_id=1, metadata=payload)
+
+    assert type(transaction.meta_data) is dict
+    assert transaction.meta_data == {"source": "import"}
+
+
+def test_metadata_kwarg_rejects_non_mappings() -> None:
+    with pytest.raises(TypeError):
+        Transaction(user_id=1, payment_id=1, metadata=["not", "a", "mapping"])
@@ -1,16 +1,25 @@
 from __future__ import annotations
 
 import asyncio
+from decimal import Decimal
 
 import pytest
 from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from user_service import repository
 from user_service.enums import PromptCategory
 from user_service.models import Prompt
-from user_service.schemas import PromptCreate, PromptUpdate
+from user_service.schemas import (
+    PromptCreate,
+    PromptUpdate,
+    _compiled_validator,
+    schema_validator,
+    validate_prompt_parameters,
+)
 
+from .conftest import StatementCapture
 from .factories import prompt_create_factory
 
 
@@ -29,6 +38,87 @@ def test_prompt_create_rejects_invalid_schema() -> None:
         )
 
 
+def test_schema_validator_is_shared_by_equal_schemas() -> None:
+    first = schema_validator({"type": "object", "required": ["level"]})
+    second = schema_validator({"required": ["level"], "type": "object"})
+
+    assert second is first
+    assert first.is_valid({"level": 1})
+    assert not first.is_valid({})
+
+
+def test_prompt_create_accepts_schema_orjson_cannot_encode() -> None:
+    schema = {
+        "type": "object",
+        "properties": {"strength": {"type": "number", "maximum": Decimal("1.5")}},
+    }
+
+    prompt = PromptCreate(
+        slug="decimal-bound",
+        name="Decimal Bound",
+        parameters_schema=schema,
+        parameters={"strength": 1},
+    )
+    assert prompt.parameters == {"strength": 1}
+
+    with pytest.raises(ValidationError, match="greater than the maximum"):
+        PromptCreate(
+            slug="decimal-bound",
+            name="Decimal Bound",
+            parameters_schema=schema,
+            parameters={"strength": 2},
+        )
+
+
+def test_prompt_create_reuses_compiled_validator() -> None:
+    _compiled_validator.cache_clear()
+    payload = {
+        "slug": "cached-validator",
+        "name": "Cached Validator",
+        "parameters_schema": {"type": "object", "required": ["level"]},
+        "parameters": {"level": 1},
+    }
+
+    PromptCreate(**payload)
+    PromptCreate(**payload)
+    with pytest.raises(ValidationError, match="'level' is a required property"):
+        PromptCreate(**{**payload, "parameters": {}})
+
+    info = _compiled_validator.cache_info()
+    assert info.misses == 1
+    assert info.hits == 2
+
+
+def test_prompt_parameters_are_validated_as_given() -> None:
+    schema = {
+        "type": "object",
+        "properties": {"sizes": {"type": "array"}, "ratio": {"type": "number"}},
+    }
+
+    # A tuple is not a JSON array to the validator, and NaN is still a number;
+    # neither is normalised through a JSON round-trip first.
+    with pytest.raises(ValueError, match="is not of type 'array'"):
+        validate_prompt_parameters({"sizes": (1, 2)}, schema)
+    validate_prompt_parameters({"ratio": float("nan")}, schema)
+
+
+def test_prompt_create_does_not_alias_caller_mappings() -> None:
+    parameters = {"level": 1}
+    schema = {"type": "object"}
+
+    prompt = PromptCreate(
+        slug="no-alias",
+        name="No Alias",
+        parameters_schema=schema,
+        parameters=parameters,
+    )
+    parameters["level"] = 2
+
+    assert prompt.parameters == {"level": 1}
+    assert prompt.parameters is not parameters
+    assert prompt.parameters_schema is not schema
+
+
 def test_prompt_create_rejects_mismatched_parameters() -> None:
     with pytest.raises(ValidationError):
         PromptCreate(
@@ -71,6 +161,22 @@ async def test_list_prompts_filters_by_category(
         assert {prompt.slug for prompt in all_prompts} == {"lips-soft", "cheeks-rose"}
 
 
+@pytest.mark.asyncio
+async def test_iter_prompts_streams_listed_prompts(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    async with session_factory() as session:
+        for index in range(3):
+            await repository.create_prompt(
+                session, prompt_create_factory(slug=f"stream-{index}")
+            )
+        await session.commit()
+
+        listed = await repository.list_prompts(session)
+        streamed = [prompt async for prompt in repository.iter_prompts(session)]
+        assert streamed == listed
+
+
 @pytest.mark.asyncio
 async def test_update_prompt_validates_against_schema(
     session_factory: async_sessionmaker[AsyncSession],
@@ -125,6 +231,26 @@ async def test_update_prompt_can_reactivate_version(
         assert prompt_v2.is_active is False
 
 
+@pytest.mark.asyncio
+async def test_only_one_version_per_slug_can_be_active(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    async with session_factory() as session:
+        current = await repository.create_prompt(
+            session, prompt_create_factory(slug="single-live")
+        )
+        session.add(
+            Prompt(
+                slug="single-live",
+                name="Second live version",
+                version=current.version + 1,
+                is_active=True,
+            )
+        )
+        with pytest.raises(IntegrityError):
+            await session.flush()
+
+
 @pytest.mark.asyncio
 async def test_create_prompt_versions_are_atomic(
     session_factory: async_sessionmaker[AsyncSession],
@@ -185,3 +311,23 @@ async def test_create_prompt_versions_are_atomic(
         prompt_lookup = await repository.get_prompt_by_slug(session, slug)
         assert prompt_lookup is not None
         assert prompt_lookup.version == 2
+
+
+@pytest.mark.asyncio
+async def test_create_prompt_takes_sqlite_write_lock_before_reading_version(
+    session_factory: async_sessionmaker[AsyncSession],
+    capture_statements: StatementCapture,
+) -> None:
+    async with session_factory() as session:
+        with capture_statements(session) as statements:
+            await repository.create_prompt(
+                session, prompt_create_factory(slug="immediate")
+            )
+            await session.commit()
+
+    assert statements[0] == "BEGIN IMMEDIATE"
+    # The version is computed inside the INSERT itself.
+    assert len(statements) == 3
+    assert statements[1].startswith("UPDATE prompts")
+    assert statements[2].startswith("INSERT INTO prompts")
+    assert "max(prompts.version)" in statements[2]
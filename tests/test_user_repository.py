@@ -3,25 +3,33 @@ from __future__ import annotations
 from decimal import Decimal
 
 import pytest
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy import select, text, update
+from sqlalchemy.exc import IntegrityError, InvalidRequestError
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import selectinload
 
-from user_service import services
-from user_service.models import UserProfile
+from user_service import repository, services
+from user_service.enums import UserRole
+from user_service.models import SubscriptionPlan, User, UserProfile
 from user_service.repository import (
     TelegramIdConflictError,
+    bulk_create_sessions,
+    bulk_create_users,
     create_profile,
     create_session,
     create_subscription_plan,
     create_user,
     get_profile_by_user_id,
+    get_subscription_plan,
     get_user_by_email,
+    get_user_by_id,
     get_user_with_related,
     hard_delete_user,
     update_profile,
 )
 from user_service.schemas import UserProfileUpdate, UserUpdate
 
+from .conftest import StatementCapture
 from .factories import (
     user_create_factory,
     user_profile_create_factory,
@@ -46,6 +54,194 @@ async def test_create_user_and_profile(
         assert user.profile.telegram_id == profile_data.telegram_id
 
 
+@pytest.mark.asyncio
+async def test_enum_columns_store_member_values(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    async with session_factory() as session:
+        user = await create_user(session, user_create_factory(role=UserRole.ADMIN))
+        stored = await session.scalar(
+            text("SELECT role FROM users WHERE id = :id"), {"id": user.id}
+        )
+
+        assert stored == "admin"
+
+        session.expire(user)
+        await session.refresh(user)
+        assert user.role is UserRole.ADMIN
+
+
+@pytest.mark.asyncio
+async def test_relationships_require_explicit_loading(
+    session_factory: async_sessionmaker[AsyncSession],
+    capture_statements: StatementCapture,
+) -> None:
+    async with session_factory() as session:
+        for _ in range(3):
+            user = await create_user(session, user_create_factory())
+            await create_profile(session, user_profile_create_factory(user.id))
+        await session.commit()
+
+    async with session_factory() as session:
+        users = (await session.scalars(select(User))).all()
+        with pytest.raises(InvalidRequestError):
+            users[0].profile  # noqa: B018
+
+    async with session_factory() as session:
+        with capture_statements(session) as statements:
+            users = (
+                await session.scalars(select(User).options(selectinload(User.profile)))
+            ).all()
+            assert all(user.profile is not None for user in users)
+
+    assert len(users) == 3
+    assert len(statements) == 2
+
+
+@pytest.mark.asyncio
+async def test_create_user_fetches_server_defaults_in_insert(
+    session_factory: async_sessionmaker[AsyncSession],
+    capture_statements: StatementCapture,
+) -> None:
+    async with session_factory() as session:
+        with capture_statements(session) as statements:
+            user = await create_user(session, user_create_factory())
+
+        assert user.created_at is not None
+        assert user.updated_at is not None
+
+    assert len(statements) == 1
+    assert "RETURNING" in statements[0]
+
+
+@pytest.mark.asyncio
+async def test_subscription_plan_cache_skips_repeat_selects(
+    session_factory: async_sessionmaker[AsyncSession],
+    capture_statements: StatementCapture,
+) -> None:
+    async with session_factory() as session:
+        plan = await create_subscription_plan(session, "Pro", "pro", Decimal("9.99"))
+        plan_id = plan.id
+        await session.commit()
+
+    counts: list[int] = []
+    for _ in range(2):
+        async with session_factory() as session:
+            with capture_statements(session) as statements:
+                cached = await get_subscription_plan(session, plan_id)
+            counts.append(len(statements))
+            assert cached is not None
+            assert cached in session
+            assert cached.monthly_cost == Decimal("9.99")
+
+    assert counts == [1, 0]
+
+    async with session_factory() as session:
+        plan = await get_subscription_plan(session, plan_id)
+        assert plan is not None
+        plan.monthly_cost = Decimal("19.99")
+        await session.commit()
+
+    async with session_factory() as session:
+        refreshed = await get_subscription_plan(session, plan_id)
+        assert refreshed is not None
+        assert refreshed.monthly_cost == Decimal("19.99")
+
+
+@pytest.mark.asyncio
+async def test_subscription_plan_cache_sees_core_updates(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    async with session_factory() as session:
+        plan = await create_subscription_plan(session, "Team", "team", Decimal("5"))
+        plan_id = plan.id
+        await session.commit()
+
+    async with session_factory() as session:
+        assert await get_subscription_plan(session, plan_id) is not None
+
+    async with session_factory() as session:
+        await session.execute(
+            update(SubscriptionPlan)
+            .where(SubscriptionPlan.id == plan_id)
+            .values(monthly_cost=Decimal("7.50"))
+        )
+        await session.commit()
+
+    async with session_factory() as session:
+        refreshed = await get_subscription_plan(session, plan_id)
+        assert refreshed is not None
+        assert refreshed.monthly_cost == Decimal("7.50")
+
+
+@pytest.mark.asyncio
+async def test_subscription_plan_cache_entries_expire(
+    session_factory: async_sessionmaker[AsyncSession],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(repository, "_PLAN_CACHE_TTL", 0.0)
+    async with session_factory() as session:
+        plan = await create_subscription_plan(session, "Solo", "solo", Decimal("3"))
+        plan_id = plan.id
+        await session.commit()
+
+    async with session_factory() as session:
+        assert await get_subscription_plan(session, plan_id) is not None
+
+    # Raw SQL bypasses the DML hook, as a write from another worker would.
+    async with session_factory() as session:
+        await session.execute(
+            text("UPDATE subscription_plans SET monthly_cost = 4 WHERE id = :id"),
+            {"id": plan_id},
+        )
+        await session.commit()
+
+    async with session_factory() as session:
+        refreshed = await get_subscription_plan(session, plan_id)
+        assert refreshed is not None
+        assert refreshed.monthly_cost == Decimal("4")
+
+
+@pytest.mark.asyncio
+async def test_hashed_password_loads_only_on_request(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    async with session_factory() as session:
+        user = await create_user(session, user_create_factory())
+        await session.commit()
+        user_id = user.id
+
+    async with session_factory() as session:
+        user = await get_user_by_id(session, user_id)
+        assert user is not None
+        with pytest.raises(InvalidRequestError):
+            user.hashed_password  # noqa: B018
+
+        await session.refresh(user, ["hashed_password"])
+        assert user.hashed_password == "hashed-password-value"
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_users_and_sessions(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    async with session_factory() as session:
+        created = [user_create_factory() for _ in range(3)]
+        user_ids = await bulk_create_users(session, created)
+        assert len(user_ids) == 3
+
+        session_ids = await bulk_create_sessions(
+            session, [user_session_create_factory(user_id) for user_id in user_ids]
+        )
+        assert len(session_ids) == 3
+
+        stored = (await session.scalars(select(User))).all()
+        ids_by_email = {user.email: user.id for user in stored}
+        # Ids come back in the order the rows were passed in.
+        assert user_ids == [ids_by_email[item.email] for item in created]
+        assert await bulk_create_users(session, []) == []
+
+
 @pytest.mark.asyncio
 async def test_unique_email_constraint(
     session_factory: async_sessionmaker[AsyncSession],
@@ -74,6 +270,26 @@ async def test_unique_telegram_constraint(
             await create_profile(session, profile_two)
 
 
+@pytest.mark.asyncio
+async def test_update_profile_rejects_taken_telegram_id(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    async with session_factory() as session:
+        first_user = await create_user(session, user_create_factory())
+        second_user = await create_user(session, user_create_factory())
+        await create_profile(
+            session, user_profile_create_factory(first_user.id, telegram_id=8_888_888)
+        )
+        profile = await create_profile(
+            session, user_profile_create_factory(second_user.id)
+        )
+
+        with pytest.raises(TelegramIdConflictError):
+            await update_profile(
+                session, profile, UserProfileUpdate(telegram_id=8_888_888)
+            )
+
+
 @pytest.mark.asyncio
 async def test_adjust_balance_via_service(
     session_factory: async_sessionmaker[AsyncSession],
@@ -88,6 +304,24 @@ async def test_adjust_balance_via_service(
         assert decreased == Decimal("6.99")
 
 
+@pytest.mark.asyncio
+async def test_adjust_balance_updates_loaded_user_without_refresh(
+    session_factory: async_sessionmaker[AsyncSession],
+    capture_statements: StatementCapture,
+) -> None:
+    async with session_factory() as session:
+        user = await create_user(session, user_create_factory())
+        with capture_statements(session) as statements:
+            await services.adjust_balance_by(session, user, Decimal("4.50"))
+
+        # Both values come from the UPDATE's RETURNING clause.
+        assert user.balance == Decimal("4.50")
+        assert user.updated_at is not None
+
+    assert len(statements) == 1
+    assert statements[0].startswith("UPDATE users")
+
+
 @pytest.mark.asyncio
 async def test_session_service_lifecycle(
     session_factory: async_sessionmaker[AsyncSession],
@@ -102,14 +336,19 @@ async def test_session_service_lifecycle(
         revoked = await services.revoke_session_by_token(
             session, user_session.session_token
         )
-        assert revoked is not None
+        assert revoked is user_session
         assert revoked.revoked_at is not None
+        assert (
+            await services.revoke_session_by_token(session, user_session.session_token)
+            is None
+        )
 
         expired = await services.expire_session_by_token(
             session, user_session.session_token
         )
-        assert expired is not None
+        assert expired is user_session
         assert expired.ended_at is not None
+        assert expired.revoked_at is not None
 
 
 @pytest.mark.asyncio
@@ -142,6 +381,54 @@ async def test_cascade_delete_user(
         assert related is None
 
 
+@pytest.mark.asyncio
+async def test_hard_delete_leaves_children_to_database_cascade(
+    session_factory: async_sessionmaker[AsyncSession],
+    capture_statements: StatementCapture,
+) -> None:
+    async with session_factory() as session:
+        user = await create_user(session, user_create_factory())
+        await create_profile(session, user_profile_create_factory(user.id))
+        for _ in range(3):
+            await create_session(session, user_session_create_factory(user.id))
+        await session.commit()
+        user_id = user.id
+
+    async with session_factory() as session:
+        user = await get_user_by_id(session, user_id)
+        assert user is not None
+        with capture_statements(session) as statements:
+            await hard_delete_user(session, user)
+
+    assert len(statements) == 1
+    assert statements[0].startswith("DELETE FROM users")
+
+
+@pytest.mark.asyncio
+async def test_get_user_with_related_loads_collections_separately(
+    session_factory: async_sessionmaker[AsyncSession],
+    capture_statements: StatementCapture,
+) -> None:
+    async with session_factory() as session:
+        user = await create_user(session, user_create_factory())
+        for _ in range(3):
+            await create_session(session, user_session_create_factory(user.id))
+        await session.commit()
+        user_id = user.id
+
+    async with session_factory() as session:
+        with capture_statements(session) as statements:
+            related = await get_user_with_related(session, user_id)
+
+        assert related is not None
+        assert len(related.sessions) == 3
+        assert related.subscriptions == []
+
+    # One query for the user and its to-one relations, one per collection.
+    assert len(statements) == 3
+    assert all(" IN (" in statement for statement in statements[1:])
+
+
 @pytest.mark.asyncio
 async def test_soft_delete_sets_timestamp(
     session_factory: async_sessionmaker[AsyncSession],
@@ -163,6 +450,7 @@ async def test_service_register_user_with_profile(
         profile_template = user_profile_create_factory(user_id=0)
 
         user = await services.register_user(session, user_data, profile_template)
+        assert user.profile.user is user
 
         fetched = await get_user_with_related(session, user.id)
         assert fetched is not None
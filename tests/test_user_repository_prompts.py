@@ -6,6 +6,7 @@ from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from user_service.enums import PromptCategory
 from user_service.repository import (
     create_prompt,
+    get_latest_prompts_by_slugs,
     get_prompt_by_slug,
     list_prompts,
     update_prompt,
@@ -357,3 +358,34 @@ async def test_list_prompts_with_string_category(
         lips_prompts = await list_prompts(session, category="lips")
         assert len(lips_prompts) == 1
         assert lips_prompts[0].slug == "lips-cat"
+
+
+@pytest.mark.asyncio
+async def test_get_latest_prompts_by_slugs_returns_newest_version_per_slug(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    """Test get_latest_prompts_by_slugs resolves several slugs at once."""
+    async with session_factory() as session:
+        for _ in range(2):
+            await create_prompt(session, prompt_create_factory(slug="batch-a"))
+        await create_prompt(session, prompt_create_factory(slug="batch-b"))
+        await create_prompt(
+            session, prompt_create_factory(slug="batch-c", is_active=False)
+        )
+        await session.commit()
+
+        latest = await get_latest_prompts_by_slugs(
+            session, ["batch-a", "batch-b", "batch-c", "missing", "batch-a"]
+        )
+        assert {slug: prompt.version for slug, prompt in latest.items()} == {
+            "batch-a": 2,
+            "batch-b": 1,
+        }
+
+        # Inactive versions are included with active_only=False
+        everything = await get_latest_prompts_by_slugs(
+            session, ["batch-c"], active_only=False
+        )
+        assert everything["batch-c"].version == 1
+
+        assert await get_latest_prompts_by_slugs(session, []) == {}